@@ -2,7 +2,6 @@ import os
 from v2.core.event_queue import EventQueue
 from v2.core.events import (
     AppStarted,
-    Command,
     PlaySpeech,
     PrepareMonologue,
     PrepareCommentResponse,
@@ -128,6 +127,8 @@ def main(argv=None):
         audio_manager,  # AudioManagerを渡す
         theme_file=args.theme # テーマファイルのパスを渡す
     )
+    for command_type, handler in command_handlers.items():
+        main_controller.register_command_handler(command_type, handler)
 
     # 5. コメント監視と日次要約スケジューラーを開始
     comment_manager.start()
@@ -156,17 +157,8 @@ def main(argv=None):
                 if not _is_filler_event(item):
                     _reset_filler_state()
                 
-                if isinstance(item, Command):
-                    handler = command_handlers.get(type(item))
-                    if handler:
-                        handler(item)
-                    else:
-                        item_name = type(item).__name__
-                        log_message(
-                            f"[Main] Warning: No handler for command {item_name}"
-                        )
-                else:  # It's an Event
-                    main_controller.process_item(item)
+                if not main_controller.dispatch(item):
+                    log_message(f"[Main] Warning: No handler for command {type(item).__name__}")
                 
                 # 定期的なシャットダウンチェック
                 event_counter += 1
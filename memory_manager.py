@@ -2,7 +2,7 @@ import time
 import queue
 import threading
 from collections import deque
-from typing import Optional
+from typing import Iterable, Optional
 import re
 import os
 from openai_adapter import OpenAIAdapter
@@ -82,6 +82,20 @@ class MemoryManager:
         self.total_utterances += 1
         self._check_and_schedule_summary()
 
+    def add_utterances(self, texts: Iterable[str], speaker: str = "蒼月ハヤテ"):
+        """
+        複数の発言をまとめて短期記憶に追加する。
+        要約タイミングのチェックは全件追加後に一度だけ行う。
+
+        Args:
+            texts: 発言内容の列
+            speaker: 発言者名
+        """
+        entries = [f"{speaker}: {text}" for text in texts]
+        self.utterances.extend(entries)
+        self.total_utterances += len(entries)
+        self._check_and_schedule_summary()
+
     def _check_and_schedule_summary(self):
         """
         要約のタイミングをチェックし、条件を満たしていればタスクをキューに入れる。
@@ -324,9 +338,9 @@ class MemoryManager:
     time.localtime(stats['last_summary_time'])
 )}
 """
+                # ヘッダーと本文を連結して一度の書き込みで保存する
                 with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(header)
-                    f.write("\n" + current_summary_content)
+                    f.write(f"{header}\n{current_summary_content}")
 
                 print(f"💾 長期記憶をファイルに保存しました: {file_path}")
 
@@ -1,7 +1,7 @@
 import queue
 import time
 import uuid
-from typing import Optional
+from typing import Callable, Optional
 from v2.core.event_queue import EventQueue, QueueItem
 from v2.state.state_manager import StateManager, SystemState
 from v2.core.logger import get_logger
@@ -15,6 +15,9 @@ from v2.core.events import (
 )
 from v2.services.obs_text_manager import OBSTextManager
 
+# プリフェッチ用に発行する独り言タスクのID接頭辞
+PREFETCH_TASK_PREFIX = "prefetch_"
+
 
 class MainController:
     """
@@ -55,7 +58,7 @@ class MainController:
         self.prefetch_queue_size = 2
         self.prefetched_monologues = queue.Queue(maxsize=self.prefetch_queue_size)
         self.is_prefetching = False # プリフェッチ中フラグ
-        self.command_handlers = {}  # MainControllerはコマンドを直接処理しない
+        self.command_handlers = {}  # コマンド型 -> 処理関数（register_command_handlerで登録）
 
         # キューイングシステムの初期化
         self.queued_comment_responses = []  # 保留中のコメント応答
@@ -110,14 +113,33 @@ class MainController:
             
         return result
 
+    def reset(self):
+        """実行時の状態を初期値に戻す（キュー・マネージャー・OBS連携などの依存はそのまま使い回す）"""
+        self.post_greeting_response_count = 0
+        self.theme_reading_completed = False
+        self.clear_prefetch_queue()
+        self.is_prefetching = False
+        self.queued_comment_responses = []
+        self.stream_start_time = time.time()
+        self.event_queue.drain_nowait()
+
     def clear_prefetch_queue(self):
         """プリフェッチされたモノローグのキューをクリアする。"""
-        while not self.prefetched_monologues.empty():
+        self._drain_prefetch_queue()
+        self.logger.info("Prefetch queue has been cleared.")
+
+    def _drain_prefetch_queue(self) -> list:
+        """プリフェッチキューの中身をすべて取り出して返す（Queueの公開APIだけを使う）。"""
+        prefetched = self.prefetched_monologues
+        items = []
+        while True:
             try:
-                self.prefetched_monologues.get_nowait()
+                items.append(prefetched.get_nowait())
             except queue.Empty:
                 break
-        self.logger.info("Prefetch queue has been cleared.")
+            # 取り出した分は処理済みにして、join() の未完了数を合わせる
+            prefetched.task_done()
+        return items
 
     def run(self):
         """メインのイベントループ。"""
@@ -140,11 +162,32 @@ class MainController:
                 item = self.event_queue.get()
             else:
                 item = self.event_queue.get_nowait()
-            self.process_item(item)
+            self.dispatch(item)
         except queue.Empty:
             # ノンブロッキングモードでキューが空の場合は何もしない
             pass
             
+    def register_command_handler(self, command_type: type, handler: Callable[[Command], None]):
+        """コマンド型に対する処理関数を登録する。"""
+        self.command_handlers[command_type] = handler
+
+    def dispatch(self, item: QueueItem) -> bool:
+        """
+        キューから取り出したアイテムを振り分ける。
+        すべてのアイテムを process_item に渡し（イベントは処理、コマンドは記録）、
+        登録済みのコマンドはさらにその処理関数へ渡す。
+        処理関数が未登録のコマンドだった場合だけ False を返す。
+        """
+        self.process_item(item)
+        if not isinstance(item, Command):
+            return True
+        
+        handler = self.command_handlers.get(type(item))
+        if handler is None:
+            return False
+        handler(item)
+        return True
+
     def process_item(self, item: QueueItem):
         """イベントまたはコマンドを処理する。"""
         item_type = type(item).__name__
@@ -173,27 +216,33 @@ class MainController:
                     event_name=item_type
                 )
         elif isinstance(item, Command):
-            # コマンドの場合は何もしない（main_v2.pyのディスパッチャが処理）
+            # コマンドの場合は記録だけする（処理関数への受け渡しは dispatch が行う）
             self.logger.log_command(item_type, {"item_data": str(item)})
 
     # --- Prefetch System ---
     
     def start_prefetch_if_needed(self):
         """必要に応じてプリフェッチを開始"""
+        command = self._create_prefetch_command_if_needed()
+        if command:
+            self.event_queue.put(command)
+    
+    def _create_prefetch_command_if_needed(self) -> Optional[PrepareMonologue]:
+        """プリフェッチが必要ならプリフェッチ中にして、発行すべきコマンドを返す（キューには入れない）"""
         if (self.prefetched_monologues.qsize() < self.prefetch_queue_size and 
             not self.is_prefetching):
             
             self.is_prefetching = True
-            prefetch_task_id = f"prefetch_{uuid.uuid4()}"
+            prefetch_task_id = f"{PREFETCH_TASK_PREFIX}{uuid.uuid4()}"
             
             print(f"[MainController] 🔄 Starting prefetch (queue: {self.prefetched_monologues.qsize()}/{self.prefetch_queue_size}, task: {prefetch_task_id})")
             self.logger.info("Starting prefetch", 
                            task_id=prefetch_task_id,
                            queue_size=self.prefetched_monologues.qsize())
             
-            # プリフェッチ用の独り言生成コマンドを発行
-            command = PrepareMonologue(task_id=prefetch_task_id)
-            self.event_queue.put(command)
+            # プリフェッチ用の独り言生成コマンド
+            return PrepareMonologue(task_id=prefetch_task_id)
+        return None
     
     def consume_prefetch_if_available(self) -> Optional[dict]:
         """プリフェッチされた独り言があれば取得"""
@@ -420,7 +469,6 @@ class MainController:
                 )
                 
                 command = PlaySpeech(task_id=prefetched['task_id'], sentences=prefetched['sentences'])
-                self.event_queue.put(command)
             else:
                 # プリフェッチがない場合は通常の独り言生成
                 next_task_id = str(uuid.uuid4())
@@ -432,10 +480,13 @@ class MainController:
                 )
                 
                 command = PrepareMonologue(task_id=next_task_id)
-                self.event_queue.put(command)
             
-            # 新しいプリフェッチを開始
-            self.start_prefetch_if_needed()
+            # 新しいプリフェッチの開始コマンドと合わせてまとめてキューに入れる
+            prefetch_command = self._create_prefetch_command_if_needed()
+            if prefetch_command:
+                self.event_queue.put_many((command, prefetch_command))
+            else:
+                self.event_queue.put(command)
 
         except Exception as e:
             self.logger.error(f"Failed to schedule monologue or filler: {e}")
@@ -446,7 +497,7 @@ class MainController:
         task_id = event.task_id
         
         # プリフェッチタスクかどうかを判定
-        if task_id.startswith("prefetch_"):
+        if task_id.startswith(PREFETCH_TASK_PREFIX):
             # プリフェッチキューに追加
             print(f"[MainController] 🎯 Prefetched monologue ready: {task_id}")
             self.add_to_prefetch_queue(task_id, event.sentences)
@@ -457,11 +508,13 @@ class MainController:
         # THINKING状態からSPEAKING状態に変更
         self.state_manager.set_state(SystemState.SPEAKING, task_id, "monologue")
         
+        # 準備できた文章を再生するコマンド（不変なので字幕表示と再生で同じものを使う）
+        command = PlaySpeech(task_id=task_id, sentences=event.sentences)
+        
         # OBSに字幕を表示
-        self.obs_text_manager.handle_play_speech(PlaySpeech(task_id=task_id, sentences=event.sentences))
+        self.obs_text_manager.handle_play_speech(command)
         
-        # 準備できた文章を再生するコマンドを発行
-        command = PlaySpeech(task_id=task_id, sentences=event.sentences)
+        # 再生コマンドを発行
         self.event_queue.put(command)
 
     def handle_new_comment_received(self, event: NewCommentReceived):
@@ -587,31 +640,25 @@ class MainController:
             
             # キューの内容を確認し、古いものがあればクリア
             if not self.prefetched_monologues.empty():
-                # キューの先頭要素の年齢をチェック（古い順に並んでいる前提）
-                try:
-                    # 一時的に取得してチェック（戻す）
-                    temp_queue = []
-                    old_items_found = False
-                    
-                    while not self.prefetched_monologues.empty():
-                        item = self.prefetched_monologues.get_nowait()
-                        item_age = current_time - item.get('created_at', 0)
-                        
-                        if item_age > prefetch_age_limit:
-                            old_items_found = True
-                            print(f"[MainController] ⏰ Discarding old prefetch item: {item['task_id']} (age: {item_age:.1f}s)")
-                        else:
-                            temp_queue.append(item)
-                    
-                    # 有効なアイテムを戻す
-                    for item in temp_queue:
-                        self.prefetched_monologues.put_nowait(item)
-                    
-                    if old_items_found:
-                        print(f"[MainController] ♻️ Cleaned prefetch queue: {len(temp_queue)} items remaining")
+                # キューの中身を取り出して年齢を確認し、有効なアイテムだけを戻す
+                temp_queue = []
+                old_items_found = False
+                
+                for item in self._drain_prefetch_queue():
+                    item_age = current_time - item.get('created_at', 0)
                     
-                except queue.Empty:
-                    pass
+                    if item_age > prefetch_age_limit:
+                        old_items_found = True
+                        print(f"[MainController] ⏰ Discarding old prefetch item: {item['task_id']} (age: {item_age:.1f}s)")
+                    else:
+                        temp_queue.append(item)
+                
+                # 有効なアイテムを戻す（取り出した数以下なので満杯にはならない）
+                for item in temp_queue:
+                    self.prefetched_monologues.put_nowait(item)
+                
+                if old_items_found:
+                    print(f"[MainController] ♻️ Cleaned prefetch queue: {len(temp_queue)} items remaining")
             
             # 通常モードでは、キューサイズが小さい場合は保持（再生成コストを避ける）
             queue_size = self.prefetched_monologues.qsize()
@@ -1,5 +1,5 @@
 import queue
-from typing import Union
+from typing import Callable, Iterable, List, Optional, Tuple, Type, Union
 
 from v2.core.events import Event, Command
 
@@ -8,12 +8,41 @@ QueueItem = Union[Event, Command]
 
 
 class EventQueue:
+    __slots__ = ("_queue", "_type_callbacks")
+
     def __init__(self):
-        self._queue = queue.Queue()
+        # put/get しか使わないため、C実装でロックの軽い SimpleQueue を使う
+        self._queue = queue.SimpleQueue()
+        # (型, コールバック) の組。put中に走査されるため、登録時はタプルごと差し替える
+        self._type_callbacks: Tuple[Tuple[Type, Callable[[QueueItem], None]], ...] = ()
+
+    def register_type_callback(self, item_type: Type, callback: Callable[[QueueItem], None]):
+        """指定した型の項目がputされたときに、呼び出し元スレッドで同期的に呼ばれるコールバックを登録する。
+        項目自体は通常どおりキューにも追加される。
+        """
+        self._type_callbacks = self._type_callbacks + ((item_type, callback),)
+
+    def _notify(self, item: QueueItem):
+        for item_type, callback in self._type_callbacks:
+            if isinstance(item, item_type):
+                callback(item)
 
     def put(self, item: QueueItem):
         """イベントまたはコマンドをキューに追加する。"""
         self._queue.put(item)
+        if self._type_callbacks:
+            self._notify(item)
+
+    def put_many(self, items: Iterable[QueueItem]):
+        """複数のイベントまたはコマンドを順序を保ってまとめてキューに追加する。"""
+        put = self._queue.put
+        if self._type_callbacks:
+            for item in items:
+                put(item)
+                self._notify(item)
+        else:
+            for item in items:
+                put(item)
 
     def get(self, block=True, timeout=None) -> QueueItem:
         """キューからイベントまたはコマンドを取得する。
@@ -27,6 +56,19 @@ class EventQueue:
         """
         return self._queue.get_nowait()
 
+    def drain_nowait(self, limit: Optional[int] = None) -> List[QueueItem]:
+        """
+        キューに溜まっている項目をノンブロッキングで取り出して返す。
+        limit を指定した場合は最大でその件数だけ取り出し、残りはキューに残す。
+        """
+        items = []
+        try:
+            while limit is None or len(items) < limit:
+                items.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
     def empty(self) -> bool:
         """キューが空かどうかを返す。"""
         return self._queue.empty()
@@ -1,10 +1,12 @@
 import time
 import threading
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
+import numpy as np
+
 
 @dataclass
 class MetricEvent:
@@ -101,6 +103,42 @@ class MetricsCollector:
         self.record_counter(component, f"{operation}_{result}", 1, 
                           operation=operation, **metadata)
 
+    def record_duration_bulk(self, component: str, operation: str,
+                             samples: Iterable[Tuple[float, bool]], **metadata):
+        """複数の実行時間 (duration, success) をまとめて記録（ロック取得は1回）"""
+        histogram_name = f"{operation}_duration"
+        histogram_key = f"{component}.{histogram_name}"
+        
+        with self.lock:
+            timestamp = time.time()
+            histogram = self.histograms[histogram_key]
+            
+            for duration, success in samples:
+                histogram.append(duration)
+                self.events.append(MetricEvent(
+                    timestamp=timestamp,
+                    component=component,
+                    metric_type="histogram",
+                    value=duration,
+                    metadata={"metric_name": histogram_name, "success": success,
+                              "operation": operation, **metadata}
+                ))
+                
+                # 成功/失敗カウンターも更新
+                counter_name = f"{operation}_{'success' if success else 'error'}"
+                self.counters[f"{component}.{counter_name}"] += 1
+                self.events.append(MetricEvent(
+                    timestamp=timestamp,
+                    component=component,
+                    metric_type="counter",
+                    value=1,
+                    metadata={"metric_name": counter_name, "operation": operation, **metadata}
+                ))
+            
+            # 古いデータを削除（最大1000件まで保持）
+            if len(histogram) > 1000:
+                self.histograms[histogram_key] = histogram[-1000:]
+
     def get_metrics_summary(self) -> Dict[str, Any]:
         """メトリクスのサマリー情報を取得"""
         with self.lock:
@@ -123,25 +161,26 @@ class MetricsCollector:
             
             return summary
 
-    def _calculate_histogram_stats(self) -> Dict[str, Dict[str, float]]:
-        """ヒストグラムデータの統計情報を計算"""
+    def _calculate_histogram_stats(self, prefix: str = "") -> Dict[str, Dict[str, float]]:
+        """ヒストグラムデータの統計情報を計算（prefixを指定するとそのキーだけ）"""
         stats = {}
         
         for key, values in self.histograms.items():
-            if not values:
+            if not values or not key.startswith(prefix):
                 continue
-                
-            values_sorted = sorted(values)
+            
+            # ソート・平均はNumPyでまとめて計算する
+            values_sorted = np.sort(np.asarray(values, dtype=np.float64))
             count = len(values_sorted)
             
             stats[key] = {
                 "count": count,
-                "min": min(values_sorted),
-                "max": max(values_sorted),
-                "mean": sum(values_sorted) / count,
-                "median": values_sorted[count // 2],
-                "p95": values_sorted[int(count * 0.95)] if count > 0 else 0,
-                "p99": values_sorted[int(count * 0.99)] if count > 0 else 0
+                "min": float(values_sorted[0]),
+                "max": float(values_sorted[-1]),
+                "mean": float(values_sorted.mean()),
+                "median": float(values_sorted[count // 2]),
+                "p95": float(values_sorted[int(count * 0.95)]),
+                "p99": float(values_sorted[int(count * 0.99)])
             }
             
         return stats
@@ -151,15 +190,12 @@ class MetricsCollector:
         with self.lock:
             component_counters = {k: v for k, v in self.counters.items() if k.startswith(f"{component}.")}
             component_gauges = {k: v for k, v in self.gauges.items() if k.startswith(f"{component}.")}
-            component_histograms = {k: v for k, v in self.histograms.items() if k.startswith(f"{component}.")}
             
             return {
                 "component": component,
                 "counters": component_counters,
                 "gauges": component_gauges,
-                "histograms": {k: self._calculate_histogram_stats()[k] 
-                             for k in component_histograms.keys() 
-                             if k in self._calculate_histogram_stats()}
+                "histograms": self._calculate_histogram_stats(f"{component}.")
             }
 
     def get_system_health(self) -> Dict[str, Any]:
@@ -232,6 +268,11 @@ def record_performance(component: str, operation: str, duration: float, success:
     collector = get_metrics_collector()
     collector.record_duration(component, operation, duration, success, **metadata)
 
+def record_performance_bulk(component: str, operation: str, samples: Iterable[Tuple[float, bool]], **metadata):
+    """複数のパフォーマンスメトリクスをまとめて記録するヘルパー関数"""
+    collector = get_metrics_collector()
+    collector.record_duration_bulk(component, operation, samples, **metadata)
+
 def record_event(component: str, event_name: str, count: int = 1, **metadata):
     """イベントカウンターを記録するヘルパー関数"""
     collector = get_metrics_collector()
@@ -251,7 +292,7 @@ def measure_performance(component: str, operation: Optional[str] = None):
         op_name = operation or func.__name__
         
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start_time = time.perf_counter()
             success = True
             
             try:
@@ -261,7 +302,7 @@ def measure_performance(component: str, operation: Optional[str] = None):
                 success = False
                 raise
             finally:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 record_performance(component, op_name, duration, success)
                 
         return wrapper
@@ -3,7 +3,7 @@ import sys
 import os
 import time
 import concurrent.futures
-from typing import List, Any
+from typing import List, Any, Optional
 
 # プロジェクトルートをパスに追加してimportを可能にする
 sys.path.insert(
@@ -14,7 +14,7 @@ sys.path.insert(
 from v2.core.event_queue import EventQueue
 from v2.core.events import CommentResponseReady, PrepareCommentResponse
 from v2.services.prompt_manager import PromptManager
-from v2.utils.comment_filter import CommentFilter
+from v2.utils.comment_filter import CommentFilter, FilterResult
 from v2.handlers.mode_manager import ModeManager, ConversationMode
 from v2.handlers.master_prompt_manager import MasterPromptManager
 from openai_adapter import OpenAIAdapter
@@ -481,7 +481,7 @@ class CommentHandler:
 
     def _filter_comments_parallel(self, comments: List[Any]) -> List[dict]:
         """
-        コメントを並列でフィルタリングする（高速化版）
+        コメントをまとめてフィルタリングする（高速化版）
         """
         print(f"[CommentHandler] 🔍 _filter_comments_parallel called with {len(comments)} comments")
         
@@ -498,67 +498,47 @@ class CommentHandler:
             comment = comments[0]
             try:
                 filter_result = self.comment_filter.filter_comment(comment)
-                if filter_result['allowed']:
+                if filter_result.allowed:
                     filtered_comment = comment.copy()
-                    filtered_comment['message'] = filter_result['cleaned']
+                    filtered_comment['message'] = filter_result.cleaned
                     return [filtered_comment]
                 return []
             except Exception as e:
                 print(f"[CommentHandler] ❌ Error in single comment filtering: {e}")
                 return []
         
-        print(f"[CommentHandler] 🔄 Starting parallel filtering for {len(comments)} comments")
-        
-        # ThreadPoolExecutorで並列フィルタリング（タイムアウト付き）
-        filtered_comments = []
+        print(f"[CommentHandler] 🔄 Starting batch filtering for {len(comments)} comments")
         
+        # NGワードの走査は全コメント分を一括で行う
         try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(comments), 8)) as executor:
-                # 全コメントのフィルタリングを同時に開始
-                future_to_comment = {
-                    executor.submit(self._filter_single_comment, comment, i): comment 
-                    for i, comment in enumerate(comments)
-                }
-                
-                # 結果を収集（10秒タイムアウト）
-                for future in concurrent.futures.as_completed(future_to_comment, timeout=10.0):
-                    original_comment = future_to_comment[future]
-                    try:
-                        filtered_comment = future.result()
-                        if filtered_comment:
-                            filtered_comments.append(filtered_comment)
-                    except Exception as e:
-                        print(f"[CommentHandler] ❌ Filtering error for comment: {e}")
-        except concurrent.futures.TimeoutError:
-            print("[CommentHandler] ⚠️ Comment filtering timeout, using partial results")
+            filter_results = self.comment_filter.filter_comments_batch(comments)
         except Exception as e:
-            print(f"[CommentHandler] ⚠️ Error in parallel filtering: {e}")
-            # フォールバック：シンプルフィルタリング
-            for comment in comments:
-                try:
-                    filter_result = self.comment_filter.filter_comment(comment) if self.comment_filter else {'allowed': True, 'cleaned': self._extract_comment_text(comment)}
-                    if filter_result['allowed']:
-                        filtered_comment = comment.copy()
-                        filtered_comment['message'] = filter_result['cleaned']
-                        filtered_comments.append(filtered_comment)
-                except Exception:
-                    continue
+            print(f"[CommentHandler] ⚠️ Error in batch filtering: {e}")
+            # フォールバック：1件ずつフィルタリング
+            filter_results = [None] * len(comments)
+        
+        filtered_comments = []
+        for i, (comment, filter_result) in enumerate(zip(comments, filter_results)):
+            filtered_comment = self._filter_single_comment(comment, i, filter_result)
+            if filtered_comment:
+                filtered_comments.append(filtered_comment)
         
         return filtered_comments
     
-    def _filter_single_comment(self, comment: Any, index: int) -> dict:
+    def _filter_single_comment(self, comment: Any, index: int, filter_result: Optional[FilterResult] = None) -> dict:
         """
-        単一コメントのフィルタリングを行う（並列実行用）
+        単一コメントのフィルタリングを行う（filter_resultが渡されればそれを使う）
         """
         try:
-            filter_result = self.comment_filter.filter_comment(comment)
-            if filter_result['allowed']:
+            if filter_result is None:
+                filter_result = self.comment_filter.filter_comment(comment)
+            if filter_result.allowed:
                 filtered_comment = comment.copy()
-                filtered_comment['message'] = filter_result['cleaned']
-                print(f"[CommentHandler] ✅ Comment {index+1} allowed: {filter_result['cleaned'][:30]}...")
+                filtered_comment['message'] = filter_result.cleaned
+                print(f"[CommentHandler] ✅ Comment {index+1} allowed: {filter_result.cleaned[:30]}...")
                 return filtered_comment
             else:
-                print(f"[CommentHandler] ❌ Comment {index+1} filtered: {filter_result['reason']}")
+                print(f"[CommentHandler] ❌ Comment {index+1} filtered: {filter_result.reason}")
                 return None
         except Exception as e:
             print(f"[CommentHandler] ❌ Error filtering comment {index+1}: {e}")
@@ -1,7 +1,8 @@
+import functools
 import os
 import sys
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, FrozenSet, Optional, List, Tuple
 
 # プロジェクトルートをパスに追加してimportを可能にする
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -9,6 +10,75 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from config import config
 
 
+@functools.lru_cache(maxsize=4)
+def _load_master_template(path: str, mtime_ns: int) -> str:
+    """マスタープロンプトを読み込む（パスと更新時刻が同じ間はキャッシュを返す）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# タスク指示から拾う一般的なキーワード
+_COMMON_KEYWORDS = (
+    "配信", "YouTube", "思考", "意識", "AI", "情報", "観測", "分析",
+    "論理", "計算", "プログラム", "データ", "システム", "ネットワーク",
+    "人間", "対話", "コミュニケーション", "学習", "進化", "自己",
+    "存在", "哲学", "科学", "数学", "宇宙", "現実", "真実", "知識"
+)
+
+# キーワードが1つもない場合の基本キーワード
+_DEFAULT_KEYWORDS = ("プロフィール", "性格", "価値観")
+
+
+@functools.lru_cache(maxsize=256)
+def _extract_keywords(task_instruction: str) -> Tuple[str, ...]:
+    """タスク指示からキーワードを抽出（同じタスク指示は結果を再利用）"""
+    keywords = tuple(keyword for keyword in _COMMON_KEYWORDS if keyword in task_instruction)
+    return keywords or _DEFAULT_KEYWORDS
+
+
+# 人格データのエントリーを索引しておくキーワード（小文字化済み）
+_KEYWORD_VOCABULARY = tuple(dict.fromkeys(keyword.lower() for keyword in _COMMON_KEYWORDS + _DEFAULT_KEYWORDS))
+
+# 人格データの索引: (エントリー一覧, エントリーごとの含有キーワード, キーワード -> エントリー番号)
+PersonaIndex = Tuple[List[str], List[FrozenSet[str]], Dict[str, List[int]]]
+
+
+def _build_persona_index(lines: List[str]) -> PersonaIndex:
+    """空行を除いたエントリーごとに含まれるキーワードを一度だけ調べ、転置索引を作る"""
+    entries = [line.strip() for line in lines if line.strip()]
+    entry_keywords = []
+    inverted: Dict[str, List[int]] = {keyword: [] for keyword in _KEYWORD_VOCABULARY}
+    for index, entry in enumerate(entries):
+        entry_lower = entry.lower()
+        found = frozenset(keyword for keyword in _KEYWORD_VOCABULARY if keyword in entry_lower)
+        entry_keywords.append(found)
+        for keyword in found:
+            inverted[keyword].append(index)
+    return entries, entry_keywords, inverted
+
+
+# 基本情報の行を示す見出し
+_PROFILE_MARKER = "【プロフィール・設定】"
+
+# タスク指示ごとの人格情報キャッシュの上限（超えたら丸ごと捨てる）
+_PERSONA_INFO_CACHE_SIZE = 256
+
+# ファイルの同一性の目安: (更新時刻(ns), サイズ)
+FileStamp = Tuple[int, int]
+
+# 人格データのキャッシュ: パス -> (ファイルの目安, (生テキスト, 行リスト, 索引))
+# パスごとに最新の1件だけを持ち、ファイルが更新されたら置き換える
+_PERSONA_CACHE: Dict[str, Tuple[FileStamp, Tuple[str, List[str], PersonaIndex]]] = {}
+
+_EMPTY_PERSONA_INDEX: PersonaIndex = ([], [], {})
+
+
+def _file_stamp(path: str) -> FileStamp:
+    """更新時刻が同じでもサイズが変わっていれば別物とみなせるよう、両方を返す"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
 class MasterPromptManager:
     """master_prompt.txtをすべての応答に反映させる管理システム"""
     
@@ -17,6 +87,13 @@ class MasterPromptManager:
         self.persona_data_path = "txt/kioku_hayate.txt"
         self.master_template = None
         self.persona_data = None
+        self.persona_lines: List[str] = []
+        self._loaded_stamp: Optional[FileStamp] = None  # 読み込んだ人格データファイルの(更新時刻, サイズ)
+        self._persona_index: PersonaIndex = _EMPTY_PERSONA_INDEX
+        self._profile_lines: List[str] = []  # 基本情報の見出しを含む行（元の行順）
+        self._essential_persona_info: Optional[str] = None  # _get_essential_persona_infoの結果
+        # タスク指示 -> 抽出済み人格情報（人格データの読み込み時にクリア）
+        self._persona_info_cache: Dict[str, str] = {}
         self._load_master_prompt()
         self._load_persona_data()
         
@@ -25,26 +102,51 @@ class MasterPromptManager:
     def _load_master_prompt(self):
         """master_prompt.txtを読み込む"""
         try:
-            with open(self.master_prompt_path, "r", encoding="utf-8") as f:
-                self.master_template = f.read()
+            mtime_ns = os.stat(self.master_prompt_path).st_mtime_ns
+            self.master_template = _load_master_template(self.master_prompt_path, mtime_ns)
             print(f"[MasterPromptManager] Master prompt loaded ({len(self.master_template)} characters)")
         except Exception as e:
             print(f"[MasterPromptManager] Error loading master prompt: {e}")
             self.master_template = self._create_fallback_master_prompt()
     
-    def _load_persona_data(self):
-        """kioku_hayate.txtから人格データを読み込む"""
+    def _load_persona_data(self, use_cache: bool = True):
+        """
+        kioku_hayate.txtから人格データを読み込む（パスと更新時刻・サイズが同じ間はキャッシュを使う）
+        use_cache=False のときはキャッシュを読みも書きもしない
+        """
+        self._persona_info_cache.clear()
+        self._essential_persona_info = None
         try:
             if os.path.exists(self.persona_data_path):
-                with open(self.persona_data_path, "r", encoding="utf-8") as f:
-                    self.persona_data = f.read()
+                stamp = _file_stamp(self.persona_data_path)
+                cached = _PERSONA_CACHE.get(self.persona_data_path) if use_cache else None
+                if cached is not None and cached[0] == stamp:
+                    persona = cached[1]
+                else:
+                    with open(self.persona_data_path, "r", encoding="utf-8") as f:
+                        raw = f.read()
+                    lines = raw.split('\n')
+                    persona = (raw, lines, _build_persona_index(lines))
+                    if use_cache:
+                        _PERSONA_CACHE[self.persona_data_path] = (stamp, persona)
+                self.persona_data, self.persona_lines, self._persona_index = persona
+                self._loaded_stamp = stamp
+                self._profile_lines = [line for line in self.persona_lines if _PROFILE_MARKER in line]
                 print(f"[MasterPromptManager] Persona data loaded ({len(self.persona_data)} characters)")
             else:
                 print(f"[MasterPromptManager] Persona data file not found: {self.persona_data_path}")
                 self.persona_data = None
+                self.persona_lines = []
+                self._loaded_stamp = None
+                self._persona_index = _EMPTY_PERSONA_INDEX
+                self._profile_lines = []
         except Exception as e:
             print(f"[MasterPromptManager] Error loading persona data: {e}")
             self.persona_data = None
+            self.persona_lines = []
+            self._loaded_stamp = None
+            self._persona_index = _EMPTY_PERSONA_INDEX
+            self._profile_lines = []
     
     def _create_fallback_master_prompt(self) -> str:
         """フォールバック用の基本マスタープロンプト"""
@@ -114,29 +216,32 @@ class MasterPromptManager:
         if not self.persona_data:
             return ""
         
+        cached = self._persona_info_cache.get(task_instruction)
+        if cached is not None:
+            return cached
+        
         try:
             # キーワードベースで関連する記憶を抽出
             keywords = self._extract_keywords_from_task(task_instruction)
-            relevant_entries = []
             
-            # 人格データを行ごとに分割して検索
-            lines = self.persona_data.split('\n')
-            for line in lines:
-                if line.strip():  # 空行をスキップ
-                    # キーワードが含まれている行を探す
-                    for keyword in keywords:
-                        if keyword.lower() in line.lower():
-                            relevant_entries.append(line.strip())
-                            break
+            # 転置索引からキーワードを含むエントリーを集める（元の行順を保つ）
+            entries, entry_keywords, inverted = self._persona_index
+            indices = sorted({index for keyword in keywords for index in inverted.get(keyword.lower(), ())})
+            relevant_entries = [entries[index] for index in indices]
+            relevant_keywords = [entry_keywords[index] for index in indices]
             
             # コンテキスト制限を考慮した最適化
-            selected_entries = self._optimize_entries_for_context(relevant_entries, keywords)
+            selected_entries = self._optimize_entries_for_context(relevant_entries, keywords, relevant_keywords)
             
             if selected_entries:
-                return "\n".join(selected_entries)
+                persona_info = "\n".join(selected_entries)
             else:
                 # キーワードマッチしない場合は簡潔な基本情報を返す
-                return self._get_essential_persona_info()
+                persona_info = self._get_essential_persona_info()
+            if len(self._persona_info_cache) >= _PERSONA_INFO_CACHE_SIZE:
+                self._persona_info_cache.clear()
+            self._persona_info_cache[task_instruction] = persona_info
+            return persona_info
                 
         except Exception as e:
             print(f"[MasterPromptManager] Error extracting persona info: {e}")
@@ -145,46 +250,23 @@ class MasterPromptManager:
     def _extract_keywords_from_task(self, task_instruction: str) -> List[str]:
         """タスク指示からキーワードを抽出"""
         # 基本的なキーワード抽出（改良の余地あり）
-        keywords = []
-        
-        # 一般的なキーワード
-        common_keywords = [
-            "配信", "YouTube", "思考", "意識", "AI", "情報", "観測", "分析",
-            "論理", "計算", "プログラム", "データ", "システム", "ネットワーク",
-            "人間", "対話", "コミュニケーション", "学習", "進化", "自己",
-            "存在", "哲学", "科学", "数学", "宇宙", "現実", "真実", "知識"
-        ]
-        
-        # タスク指示に含まれるキーワードを検索
-        for keyword in common_keywords:
-            if keyword in task_instruction:
-                keywords.append(keyword)
-        
-        # 最低限のキーワードがない場合は基本的なものを追加
-        if not keywords:
-            keywords = ["プロフィール", "性格", "価値観"]
-        
-        return keywords
+        return list(_extract_keywords(task_instruction))
     
     def _get_basic_persona_info(self) -> str:
         """基本的な人格情報を取得"""
         if not self.persona_data:
             return ""
         
-        lines = self.persona_data.split('\n')
-        basic_info = []
-        
-        # プロフィール・設定セクションから基本情報を抽出
-        for line in lines:
-            if "【プロフィール・設定】" in line:
-                basic_info.append(line.strip())
-                if len(basic_info) >= 5:  # 最大5個の基本情報
-                    break
-        
-        return "\n".join(basic_info) if basic_info else ""
+        # プロフィール・設定セクションから基本情報を抽出（最大5個）
+        return "\n".join(line.strip() for line in self._profile_lines[:5])
     
-    def _optimize_entries_for_context(self, entries: List[str], keywords: List[str]) -> List[str]:
-        """コンテキスト制限を考慮してエントリーを最適化"""
+    def _optimize_entries_for_context(self, entries: List[str], keywords: List[str],
+                                      entry_keywords: Optional[List[FrozenSet[str]]] = None) -> List[str]:
+        """コンテキスト制限を考慮してエントリーを最適化
+        
+        entry_keywords（各エントリーに含まれるキーワード集合）が渡された場合は、
+        部分文字列検索の代わりに集合の積でスコアを計算する。
+        """
         if not entries:
             return []
         
@@ -194,10 +276,14 @@ class MasterPromptManager:
         max_context_length = 800  # 人格データ部分の最大文字数
         
         # 1. キーワードマッチ数でソート（より多くのキーワードにマッチするものを優先）
-        scored_entries = []
-        for entry in entries:
-            score = sum(1 for keyword in keywords if keyword.lower() in entry.lower())
-            scored_entries.append((score, entry))
+        if entry_keywords is not None:
+            keyword_set = frozenset(keyword.lower() for keyword in keywords)
+            scored_entries = [(len(found & keyword_set), entry) for found, entry in zip(entry_keywords, entries)]
+        else:
+            scored_entries = []
+            for entry in entries:
+                score = sum(1 for keyword in keywords if keyword.lower() in entry.lower())
+                scored_entries.append((score, entry))
         
         # スコア順（降順）でソート
         scored_entries.sort(key=lambda x: x[0], reverse=True)
@@ -227,7 +313,14 @@ class MasterPromptManager:
         if not self.persona_data:
             return ""
         
-        lines = self.persona_data.split('\n')
+        # 人格データだけで決まるので、読み込みごとに一度だけ計算する
+        if self._essential_persona_info is None:
+            self._essential_persona_info = self._build_essential_persona_info()
+        return self._essential_persona_info
+    
+    def _build_essential_persona_info(self) -> str:
+        """_get_essential_persona_infoの本体"""
+        lines = self.persona_lines
         essential_info = []
         total_length = 0
         max_essential_length = 250  # より厳しい制限
@@ -243,8 +336,8 @@ class MasterPromptManager:
         
         # まず短い基本情報を探す
         for pattern_name, pattern_regex in essential_patterns:
-            for line in lines:
-                if pattern_name in line and "【プロフィール・設定】" in line:
+            for line in self._profile_lines:
+                if pattern_name in line:
                     # 長すぎる場合は短縮
                     if total_length + len(line) > max_essential_length:
                         remaining = max_essential_length - total_length
@@ -264,7 +357,7 @@ class MasterPromptManager:
         # それでも見つからない場合は、最初の短い基本情報を使用
         if not essential_info:
             for line in lines[:50]:  # 最初の50行から検索
-                if "【プロフィール・設定】" in line and len(line) < 150:
+                if _PROFILE_MARKER in line and len(line) < 150:
                     if total_length + len(line) <= max_essential_length:
                         essential_info.append(line.strip())
                         total_length += len(line)
@@ -274,16 +367,23 @@ class MasterPromptManager:
         return "\n".join(essential_info) if essential_info else ""
     
     def reload_persona_data(self):
-        """人格データファイルを再読み込み"""
+        """人格データファイルを再読み込み（前回読み込み時から更新時刻もサイズも同じなら何もしない）"""
+        try:
+            stamp = _file_stamp(self.persona_data_path)
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp == self._loaded_stamp:
+            print("[MasterPromptManager] Persona data unchanged, skipping reload")
+            return
         print("[MasterPromptManager] Reloading persona data...")
-        self._load_persona_data()
+        self._load_persona_data(use_cache=False)
     
     def get_persona_statistics(self) -> Dict[str, Any]:
         """人格データの統計情報を取得"""
         if not self.persona_data:
             return {"loaded": False, "size": 0, "entries": 0}
         
-        lines = [line.strip() for line in self.persona_data.split('\n') if line.strip()]
+        lines = [line.strip() for line in self.persona_lines if line.strip()]
         entries_count = len([line for line in lines if line.startswith('【')])
         
         return {
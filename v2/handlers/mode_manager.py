@@ -2,7 +2,8 @@ import logging
 import random
 import os
 import time
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import ClassVar, Dict, Iterable, List, Mapping, Optional, Any, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
@@ -33,7 +34,20 @@ class ModeContext:
 class ModeManager:
     """会話モード管理システム（ストーリーアーク型）"""
     
-    def __init__(self):
+    # インスタンス間で共有するテーマファイルキャッシュ
+    # ファイルパス -> ((st_mtime_ns, st_size), テーマ内容)。パスごとに最新の1件だけを持つ
+    _shared_theme_cache: ClassVar[Dict[str, Tuple[Tuple[int, int], str]]] = {}
+    # 共有キャッシュに持つファイル数の上限（超えたら最も古く読み込んだものから捨てる）
+    _SHARED_THEME_CACHE_SIZE: ClassVar[int] = 16
+    
+    def __init__(self, seed: Optional[int] = None):
+        # モード遷移・テーマ選択用の乱数生成器（seedを指定すると遷移が再現可能になる）
+        self._random = random.Random(seed)
+        self._rand = self._random.random
+        
+        # get_mode_statistics() のキャッシュ: (現在のコンテキスト, (履歴の長さ, 発言回数), 統計)
+        self._stats_cache: Optional[Tuple[ModeContext, Tuple[int, int], Mapping[str, Any]]] = None
+        
         self.current_mode = ConversationMode.NORMAL_MONOLOGUE
         self.mode_history: List[ModeContext] = []
         self.current_context = ModeContext(mode=self.current_mode)
@@ -87,6 +101,10 @@ class ModeManager:
             ConversationMode.THEMED_MONOLOGUE: (3, 7), # テーマ会話は少し長めに
         }
         
+        # should_switch_mode用の遷移表（モード定義から一度だけ作る）
+        self._comment_switch_table = self._build_comment_switch_table()
+        self._switch_probability_table = self._build_switch_probability_table()
+        
         # フォールバック用の重み設定（稀に使用）
         self.mode_weights = {
             ConversationMode.NORMAL_MONOLOGUE: 1.0,
@@ -135,42 +153,66 @@ class ModeManager:
         """現在のモードコンテキストを取得"""
         return self.current_context
 
+    def _build_comment_switch_table(self) -> Dict[Tuple[ConversationMode, bool], Optional[bool]]:
+        """(現在のモード, コメント有無) -> 切り替え判定。Noneは継続時間で判定することを表す"""
+        table = {}
+        for mode in ConversationMode:
+            # コメントがある場合は統合応答モードに切り替え
+            # （テーマ会話中はコメントがあってもモードを維持し、テーマに沿った応答を試みる）
+            table[(mode, True)] = mode not in (ConversationMode.THEMED_MONOLOGUE,
+                                               ConversationMode.INTEGRATED_RESPONSE)
+            # コメントがない場合、コメントモードからは抜ける。それ以外は継続時間で判定
+            table[(mode, False)] = True if mode == ConversationMode.INTEGRATED_RESPONSE else None
+        return table
+
+    def _build_switch_probability_table(self) -> Dict[ConversationMode, Tuple[float, ...]]:
+        """モードごとに、発言回数(添字) -> 切り替え確率 の表を作る。表の範囲外は強制切り替え"""
+        table = {}
+        for mode in ConversationMode:
+            min_duration, max_duration = self.mode_duration_ranges.get(mode, (2, 4))
+            probabilities = []
+            for duration in range(max_duration):
+                if duration < min_duration:
+                    # 最小継続時間に達していない場合は切り替えない
+                    probabilities.append(0.0)
+                else:
+                    # 最小〜最大の間では徐々に切り替え確率を上げる（20%から80%まで線形増加）
+                    progress = (duration - min_duration) / (max_duration - min_duration)
+                    probabilities.append(0.2 + (progress * 0.6))
+            table[mode] = tuple(probabilities)
+        return table
+
     def should_switch_mode(self, has_comments: bool = False, comment_count: int = 0) -> bool:
         """モード切り替えが必要かどうかを判定（ストーリーアーク型）"""
         
-        # コメントがある場合は統合応答モードに切り替え
-        if has_comments:
-            # テーマ会話中はコメントがあってもモードを維持し、テーマに沿った応答を試みる
-            if self.current_mode == ConversationMode.THEMED_MONOLOGUE:
-                return False
-            if self.current_mode != ConversationMode.INTEGRATED_RESPONSE:
-                return True
-            return False
-        
-        # コメントがない場合は独り言系モードで判定
-        if self.current_mode == ConversationMode.INTEGRATED_RESPONSE:
-            return True  # コメントモードから抜ける
-        
-        # 現在のモードの推奨継続時間を取得
-        min_duration, max_duration = self.mode_duration_ranges.get(
-            self.current_mode, (2, 4)
-        )
+        # コメントの有無だけで決まるケースは遷移表を引くだけ
+        decision = self._comment_switch_table[(self.current_mode, bool(has_comments))]
+        if decision is not None:
+            return decision
         
+        # 現在のモードの発言回数に応じた切り替え確率を取得
+        probabilities = self._switch_probability_table[self.current_mode]
         current_duration = self.current_context.duration
         
-        # 最小継続時間に達していない場合は切り替えない
-        if current_duration < min_duration:
-            return False
-            
         # 最大継続時間に達した場合は強制切り替え
-        if current_duration >= max_duration:
+        if current_duration >= len(probabilities):
             return True
-            
-        # 最小〜最大の間では徐々に切り替え確率を上げる
-        progress = (current_duration - min_duration) / (max_duration - min_duration)
-        switch_probability = 0.2 + (progress * 0.6)  # 20%から80%まで線形増加
         
-        return random.random() < switch_probability
+        switch_probability = probabilities[current_duration]
+        if switch_probability == 0.0:
+            return False
+        return self._rand() < switch_probability
+
+    def switch_probabilities(self, mode: ConversationMode, durations: Iterable[int]) -> List[float]:
+        """コメントがない場合の、指定モード・各発言回数での切り替え確率をまとめて返す（乱数は消費しない）"""
+        decision = self._comment_switch_table[(mode, False)]
+        if decision is not None:
+            return [1.0 if decision else 0.0 for _ in durations]
+        
+        probabilities = self._switch_probability_table[mode]
+        limit = len(probabilities)
+        # 最大継続時間以降は強制切り替え
+        return [probabilities[duration] if duration < limit else 1.0 for duration in durations]
 
     def switch_mode(self, target_mode: Optional[ConversationMode] = None, 
                    has_comments: bool = False, comment_count: int = 0) -> ConversationMode:
@@ -220,7 +262,7 @@ class ModeManager:
             
             if available_modes:
                 # 利用可能な推奨モードからランダム選択
-                next_mode = random.choice(available_modes)
+                next_mode = self._random.choice(available_modes)
                 print(f"[ModeManager] Flow-based selection: {self.current_mode.value} → {next_mode.value}")
                 return next_mode
             else:
@@ -245,7 +287,7 @@ class ModeManager:
         # 重み付き確率で選択
         total_weight = sum(adjusted_weights.values())
         if total_weight > 0:
-            rand_value = random.random() * total_weight
+            rand_value = self._rand() * total_weight
             current_weight = 0
             for mode, weight in adjusted_weights.items():
                 current_weight += weight
@@ -262,11 +304,11 @@ class ModeManager:
             return self.active_theme_content or "（指定テーマなし）"
 
         if mode == ConversationMode.CHILL_CHAT:
-            return random.choice(self.chill_themes)
+            return self._random.choice(self.chill_themes)
         elif mode == ConversationMode.EPISODE_DEEP_DIVE:
-            return random.choice(self.episode_themes)
+            return self._random.choice(self.episode_themes)
         elif mode == ConversationMode.VIEWER_CONSULTATION:
-            return random.choice(self.consultation_themes)
+            return self._random.choice(self.consultation_themes)
         
         return None
 
@@ -318,9 +360,15 @@ class ModeManager:
         
         return variables
 
-    def get_mode_statistics(self) -> Dict[str, Any]:
-        """モード使用統計を取得"""
-        total_contexts = len(self.mode_history) + 1  # 現在のコンテキストも含む
+    def get_mode_statistics(self) -> Mapping[str, Any]:
+        """モード使用統計を取得（履歴・現在のコンテキストが変わらない間はキャッシュを返す）"""
+        # 統計は履歴の長さと現在のコンテキスト（とその発言回数）だけで決まる
+        # コンテキストはオブジェクトそのものを持って同一性で比べる（idは解放後に再利用されうる）
+        counts = (len(self.mode_history), self.current_context.duration)
+        cached = self._stats_cache
+        if cached is not None and cached[0] is self.current_context and cached[1] == counts:
+            return cached[2]
+        
         mode_counts = {}
         
         # 履歴から集計
@@ -332,13 +380,16 @@ class ModeManager:
         current_mode_name = self.current_context.mode.value
         mode_counts[current_mode_name] = mode_counts.get(current_mode_name, 0) + self.current_context.duration
         
-        return {
+        # キャッシュを共有するため、呼び出し側から書き換えられない形で返す
+        stats = MappingProxyType({
             "current_mode": current_mode_name,
             "current_duration": self.current_context.duration,
-            "mode_usage_counts": mode_counts,
+            "mode_usage_counts": MappingProxyType(mode_counts),
             "total_mode_switches": len(self.mode_history),
-            "recent_modes": [ctx.mode.value for ctx in self.mode_history[-5:]]  # 直近5回
-        }
+            "recent_modes": tuple(ctx.mode.value for ctx in self.mode_history[-5:])  # 直近5回
+        })
+        self._stats_cache = (self.current_context, counts, stats)
+        return stats
 
     def force_mode(self, mode: ConversationMode, theme: Optional[str] = None):
         """強制的にモードを切り替える（デバッグ用）"""
@@ -423,8 +474,7 @@ class ModeManager:
         
         # ファイル読み込み
         try:
-            with open(current_path, "r", encoding="utf-8") as f:
-                theme_content = f.read()
+            theme_content = self._read_theme_file(current_path, use_shared_cache=not force_reload)
             
             # キャッシュに保存
             self._theme_file_cache[current_path] = theme_content
@@ -438,6 +488,27 @@ class ModeManager:
             print(f"[ModeManager] ❌ Error loading theme file {current_path}: {e}")
             return None
     
+    def _read_theme_file(self, path: str, use_shared_cache: bool = True) -> str:
+        """テーマファイルを読み込む（stat情報が一致すれば共有キャッシュを返す）"""
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        
+        if use_shared_cache:
+            cached = ModeManager._shared_theme_cache.get(path)
+            if cached is not None and cached[0] == stat_key:
+                return cached[1]
+        
+        with open(path, "r", encoding="utf-8") as f:
+            theme_content = f.read()
+        
+        shared_cache = ModeManager._shared_theme_cache
+        # 読み込み順を保つため、同じパスの古い内容は消してから入れ直す
+        shared_cache.pop(path, None)
+        shared_cache[path] = (stat_key, theme_content)
+        if len(shared_cache) > ModeManager._SHARED_THEME_CACHE_SIZE:
+            del shared_cache[next(iter(shared_cache))]
+        return theme_content
+    
     def set_theme_file(self, theme_file_path: str, auto_load: bool = True) -> bool:
         """テーマファイルを動的に変更する（統一メソッド）
         
@@ -81,6 +81,21 @@ class IntegratedCommentManager:
             # 新しいモードで再開
             self.start()
 
+    def set_test_mode(self, enabled: bool):
+        """
+        このインスタンスだけテストモード（ダミーコメント）を切り替える。
+        監視中の場合は新しいモードで監視スレッドを再起動する。
+        """
+        if self.test_mode == enabled:
+            return
+        
+        self.test_mode = enabled
+        print(f"[IntegratedCommentManager] Test mode set to {enabled}")
+        
+        if self.running:
+            self.stop()
+            self.start()
+
     def start(self):
         """コメント監視を開始する"""
         if self.running:
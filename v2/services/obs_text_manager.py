@@ -5,6 +5,9 @@ from v2.core.event_queue import EventQueue
 from v2.core.events import PlaySpeech, SpeechPlaybackCompleted
 from v2.obs_adaper import OBSAdapter
 
+# 字幕では改行・タブを使わないため、まとめてスペースに置換する変換テーブル
+_SUBTITLE_TRANSLATE = str.maketrans({'\n': ' ', '\r': ' ', '\t': ' '})
+
 class OBSTextManager:
     """
     OBSのテキストソースに字幕を表示するサービス。
@@ -54,10 +57,8 @@ class OBSTextManager:
         if not self.subtitles_enabled:
             return ""
             
-        # 既存の改行文字を削除してスペースに置換
-        text = text.replace('\n', ' ').replace('\r', ' ')
-        
-        return text
+        # 既存の改行・タブ文字を一度の走査でスペースに置換
+        return text.translate(_SUBTITLE_TRANSLATE)
 
     def _find_best_break_position(self, text: str) -> int:
         """
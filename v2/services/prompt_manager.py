@@ -1,7 +1,7 @@
 import os
 import random
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 # プロジェクトルートをパスに追加してimportを可能にする
@@ -26,7 +26,8 @@ class PromptManager:
     
     def __init__(self):
         self.prompts_dir = config.paths.prompts
-        self.prompt_cache: Dict[str, str] = {}
+        # ファイル名 -> (読み込み時の更新時刻, 内容)
+        self.prompt_cache: Dict[str, Tuple[int, str]] = {}
         
         # プロンプトの分類とファイルマッピング
         self.prompt_mappings = {
@@ -116,16 +117,18 @@ class PromptManager:
         return selected_file
 
     def _load_prompt(self, filename: str) -> str:
-        """プロンプトファイルを読み込む（キャッシュ機能付き）"""
-        if filename in self.prompt_cache:
-            return self.prompt_cache[filename]
-        
+        """プロンプトファイルを読み込む（更新時刻が変わるまではキャッシュを返す）"""
         file_path = os.path.join(self.prompts_dir, filename)
         
         try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+            cached = self.prompt_cache.get(filename)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
-                self.prompt_cache[filename] = content
+                self.prompt_cache[filename] = (mtime_ns, content)
                 return content
         except FileNotFoundError:
             print(f"[PromptManager] Warning: Prompt file not found: {file_path}")
@@ -19,6 +19,22 @@ class StateManager:
     V2アーキテクチャでは、このクラスはスレッド同期用のフラグを持たず、
     純粋に状態の保持と提供に専念する。
     """
+    # 状態を追加するときは、ここにも属性名を追加する（__slots__ にない属性は設定できない）
+    __slots__ = (
+        "conversation_history",
+        "current_mode",
+        "current_state",
+        "current_task_id",
+        "current_task_type",
+        "is_running",
+        "last_speech_content",
+        "last_speech_time",
+        "logger",
+        "pending_comments",
+        "prepared_responses",
+        "task_start_time",
+    )
+
     def __init__(self):
         # 会話履歴（V1のConversationHistoryに相当）
         self.conversation_history: List[Dict[str, Any]] = []
@@ -44,11 +60,25 @@ class StateManager:
         # コメントキュー（処理待ちコメント）
         self.pending_comments: List[Dict[str, Any]] = []
         
-        # その他の設定値や状態
-        # 例: self.user_name = "test_user"
-        # 例: self.ng_words = []
+        # 並行処理で生成された応答（add_prepared_response で追加される）
+        self.prepared_responses: List[Dict[str, Any]] = []
+        
         self.logger = get_logger("StateManager")
 
+    def reset(self):
+        """ロガー以外の全状態を初期値に戻す（テストでインスタンスを使い回すため）"""
+        self.conversation_history = []
+        self.current_mode = "normal"
+        self.is_running = True
+        self.current_state = SystemState.IDLE
+        self.current_task_id = None
+        self.current_task_type = None
+        self.task_start_time = None
+        self.last_speech_content = None
+        self.last_speech_time = None
+        self.pending_comments = []
+        self.prepared_responses = []
+
     def add_conversation_entry(self, role: str, content: str):
         """会話履歴に新しいエントリを追加する。"""
         self.conversation_history.append({"role": role, "content": content})
@@ -126,9 +156,6 @@ class StateManager:
     
     def add_prepared_response(self, task_id: str, sentences: List[str]):
         """並行処理で生成された応答を保存"""
-        if not hasattr(self, 'prepared_responses'):
-            self.prepared_responses: List[Dict[str, Any]] = []
-        
         response_data = {
             'task_id': task_id,
             'sentences': sentences,
@@ -138,9 +165,6 @@ class StateManager:
     
     def get_prepared_responses(self, clear: bool = True) -> List[Dict[str, Any]]:
         """生成済み応答を取得"""
-        if not hasattr(self, 'prepared_responses'):
-            return []
-        
         responses = self.prepared_responses.copy()
         if clear:
             self.prepared_responses.clear()
@@ -148,7 +172,7 @@ class StateManager:
     
     def has_prepared_responses(self) -> bool:
         """生成済み応答があるかチェック"""
-        return hasattr(self, 'prepared_responses') and len(self.prepared_responses) > 0
+        return len(self.prepared_responses) > 0
 
     def has_pending_comments(self) -> bool:
         """処理待ちコメントがあるかどうかを判定"""
@@ -0,0 +1,69 @@
+"""
+v2テスト共通のpytest設定
+プロジェクトルートをセッション開始時に一度だけ sys.path に追加する
+テスト内の例外ログ（logger.exception）のレベルは環境変数 TESTLOG で切り替える
+組み立てが重い共有オブジェクトはここでフィクスチャとして一度だけ定義する
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+logging.basicConfig(level=os.environ.get("TESTLOG", "WARNING"))
+
+
+@pytest.fixture(scope="module")
+def controller_stack():
+    """
+    (EventQueue, StateManager, MainController) をモジュールごとに一度だけ組み立てる
+    MainControllerの初期化は多数のハンドラーを組み立てて重いため、モジュール内のテストで共有する
+    ハンドラーの登録内容を書き換えるテストはこれを使わず、自前で生成すること
+    """
+    from v2.core.event_queue import EventQueue
+    from v2.state.state_manager import StateManager
+    from v2.controllers.main_controller import MainController
+    
+    event_queue = EventQueue()
+    state_manager = StateManager()
+    return event_queue, state_manager, MainController(event_queue, state_manager)
+
+
+@pytest.fixture
+def clean_controller_stack(controller_stack):
+    """共有の controller_stack を初期状態に戻して返す（MainController.reset はイベントキューも空にする）"""
+    _, state_manager, main_controller = controller_stack
+    state_manager.reset()
+    main_controller.reset()
+    return controller_stack
+
+
+@pytest.fixture(scope="session")
+def master_prompt_manager():
+    """人格データの読み込みは重いので、MasterPromptManagerはセッション全体で一度だけ生成して共有する"""
+    from v2.handlers.master_prompt_manager import MasterPromptManager
+    
+    return MasterPromptManager()
+
+
+@pytest.fixture(scope="session")
+def openai_adapter():
+    """サマリー系のテストで共有するOpenAIAdapter（セッション全体で一度だけ生成する）"""
+    from openai_adapter import OpenAIAdapter
+    
+    return OpenAIAdapter("テスト用システムプロンプト", silent_mode=True)
+
+
+@pytest.fixture(scope="session")
+def memory_manager(openai_adapter):
+    """openai_adapter を使うMemoryManager（セッション全体で一度だけ生成する）"""
+    from memory_manager import MemoryManager
+    
+    return MemoryManager(openai_adapter)
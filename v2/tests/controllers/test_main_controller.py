@@ -50,6 +50,8 @@ class TestMainController(unittest.TestCase):
         self.mock_comment_manager = MagicMock(spec=IntegratedCommentManager)
         # prefetched_monologues をモックに置き換え
         self.controller.prefetched_monologues = MagicMock(spec=queue.Queue)
+        # 空のキューとして振る舞わせる（クリア時の get_nowait が空で終わるように）
+        self.controller.prefetched_monologues.get_nowait.side_effect = queue.Empty
 
         self.controller.monologue_handler = self.mock_monologue_handler
         self.controller.comment_handler = self.mock_comment_handler
@@ -77,6 +79,31 @@ class TestMainController(unittest.TestCase):
         put_event = self.mock_event_queue.put.call_args[0][0]
         self.assertIsInstance(put_event, InitialGreetingRequested)
 
+    def test_dispatch_routes_registered_commands_and_events(self):
+        """登録済みコマンドは処理関数へ、イベントはprocess_itemへ振り分けられることを確認"""
+        play_handler = MagicMock()
+        self.controller.register_command_handler(PlaySpeech, play_handler)
+        self.controller.process_item = MagicMock()
+
+        command = PlaySpeech(task_id="test_task", sentences=["テスト"])
+        event = AppStarted()
+        self.assertTrue(self.controller.dispatch(command))
+        self.assertTrue(self.controller.dispatch(event))
+
+        play_handler.assert_called_once_with(command)
+        # コマンドも process_item で記録される
+        self.assertEqual(self.controller.process_item.call_count, 2)
+        self.controller.process_item.assert_any_call(event)
+
+    def test_dispatch_reports_unregistered_commands(self):
+        """処理関数が未登録のコマンドは記録だけしてFalseを返すことを確認"""
+        self.controller.process_item = MagicMock()
+        command = PrepareMonologue(task_id="test_task")
+
+        self.assertFalse(self.controller.dispatch(command))
+
+        self.controller.process_item.assert_called_once_with(command)
+
     def test_greeting_completion_with_comments_triggers_comment_response(self):
         """挨拶完了時にコメントがあれば、コメント応答が開始されることを確認"""
         # セットアップ
@@ -16,8 +16,7 @@ class TestAudioManager(unittest.TestCase):
 
     def setUp(self):
         """テストのセットアップ。依存関係をモック化する。"""
-        self.event_queue = EventQueue()
-        self.event_queue.put = MagicMock()
+        self.event_queue = MagicMock(spec=EventQueue)
 
         # パッチを開始
         self.aivis_patcher = patch(AIVIS_ADAPTER_PATH)
@@ -135,6 +135,19 @@ class TestIntegratedCommentManager(unittest.TestCase):
         # イベントが発行されないことを確認
         self.mock_event_queue.put.assert_not_called()
 
+    def test_set_test_mode_switches_to_dummy_comments(self):
+        """set_test_modeで同じインスタンスがダミーコメントに切り替わるかのテスト"""
+        self.comment_manager.chat = self.mock_chat
+        self.comment_manager.set_test_mode(True)
+        self.assertTrue(self.comment_manager.test_mode)
+        
+        # テストモード中はYouTubeチャットを参照しない
+        self.comment_manager._fetch_new_comments()
+        self.mock_chat.get.assert_not_called()
+        
+        self.comment_manager.set_test_mode(False)
+        self.assertFalse(self.comment_manager.test_mode)
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
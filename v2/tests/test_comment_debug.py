@@ -6,6 +6,7 @@
 
 import sys
 import os
+import logging
 import time
 import threading
 import signal
@@ -17,6 +18,9 @@ from v2.core.event_queue import EventQueue
 from v2.handlers.comment_handler import CommentHandler
 from v2.core.events import PrepareCommentResponse, CommentResponseReady
 
+logger = logging.getLogger(__name__)
+
+
 def timeout_handler(signum, frame):
     print("\n⏰ タイムアウト！30秒以内に処理が完了しませんでした")
     print("現在実行中のスレッド:")
@@ -129,8 +133,7 @@ def test_comment_processing_debug():
     except Exception as e:
         signal.alarm(0)
         print(f"❌ テスト中にエラー発生: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
 
 if __name__ == "__main__":
@@ -5,6 +5,9 @@
 
 import sys
 import os
+
+import pytest
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from v2.utils.comment_filter import CommentFilter
@@ -137,6 +140,99 @@ def test_filter_with_real_patterns():
             print(f"         | Reason: {result['reason']}")
 
 
+def test_word_boundary_matching():
+    """単語境界モードでは単語の一部に含まれるNGワードを許可する"""
+    filter_instance = CommentFilter()
+    filter_instance.add_ng_word("bot")
+    
+    def allowed(message):
+        return filter_instance.filter_comment({"message": message, "author": {"name": "viewer"}})['allowed']
+    
+    # 厳密な部分一致では単語の一部でもNG
+    assert not allowed("robot")
+    
+    filter_instance.set_matching_mode(strict=False, word_boundary=True)
+    assert allowed("robot")
+    assert not allowed("bot")
+    assert not allowed("a bot here")
+    assert not allowed("BOT!")
+    
+    # 一括フィルタリングでも隣のメッセージの境界に影響されない
+    results = filter_instance.filter_comments_batch([
+        {"message": "bot", "author": {"name": "viewer"}},
+        {"message": "robot", "author": {"name": "viewer"}},
+        {"message": "bot", "author": {"name": "viewer"}},
+    ])
+    assert [result['allowed'] for result in results] == [False, True, False]
+
+
+def test_message_result_cache():
+    """同じメッセージの判定は再利用し、NGワードの変更後は判定し直す"""
+    filter_instance = CommentFilter()
+    comment = {"message": "今日のテーマは月です", "author": {"name": "viewer"}}
+    
+    assert filter_instance.filter_comment(comment)['allowed']
+    assert filter_instance.filter_comment(dict(comment, author={"name": "other"}))['allowed']
+    assert filter_instance._filter_message.cache_info().hits == 1
+    
+    # ユーザー判定はキャッシュに含めない
+    filter_instance.add_blocked_user("viewer")
+    assert not filter_instance.filter_comment(comment)['allowed']
+    
+    filter_instance.add_ng_word("月")
+    result = filter_instance.filter_comment(dict(comment, author={"name": "other"}))
+    assert not result['allowed']
+    assert result['reason'] == 'NGワードを含んでいます: 月'
+
+
+def test_batch_skips_rejected_before_scan():
+    """文字数やユーザーで拒否されるコメントは、一括走査から外しても理由が変わらない"""
+    filter_instance = CommentFilter()
+    filter_instance.add_blocked_user("troll")
+    results = filter_instance.filter_comments_batch([
+        {"message": "spam", "author": {"name": "troll"}},
+        {"message": "", "author": {"name": "viewer"}},
+        {"message": "今日もよろしく", "author": {"name": "viewer"}},
+        {"message": "spam です", "author": {"name": "viewer"}},
+    ])
+    assert [result['allowed'] for result in results] == [False, False, True, False]
+    assert results[0]['reason'] == 'ブロックされたユーザー: troll'
+    assert results[1]['reason'].startswith('コメントが短すぎます')
+    assert results[3]['reason'] == 'NGワードを含んでいます: spam'
+
+
+def test_ng_word_reason_uses_list_order():
+    """複数のNGワード・パターンに該当する場合、理由には出現位置ではなくリスト順で最初のものを出す"""
+    filter_instance = CommentFilter()
+    comment = {"message": "spam と スパム", "author": {"name": "viewer"}}
+    
+    # 「スパム」は組み込みリストで「spam」より前にある
+    assert filter_instance.filter_comment(comment)['reason'] == 'NGワードを含んでいます: スパム'
+    results = filter_instance.filter_comments_batch([comment, comment])
+    assert results[0]['reason'] == 'NGワードを含んでいます: スパム'
+    
+    # パターンも同様に、リスト順で最初のもの（URL）を理由にする
+    result = filter_instance.filter_comment({"message": "ABCDEFGHIJKL http://example.com", "author": {"name": "viewer"}})
+    assert result['reason'] == r'不適切なパターンを含んでいます: https?://[^\s]+'
+
+
+def test_filter_result_access():
+    """判定結果は属性でも従来の添字でも参照できる"""
+    filter_instance = CommentFilter()
+    result = filter_instance.filter_comment({"message": "こんにちは", "author": {"name": "viewer"}})
+    
+    assert result.allowed and result['allowed']
+    assert result.reason == result['reason'] == 'フィルタリング通過'
+    assert result['cleaned'] == "こんにちは"
+    with pytest.raises(KeyError):
+        result['missing']
+
+
 if __name__ == "__main__":
     test_comment_filter()
-    test_filter_with_real_patterns()
\ No newline at end of file
+    test_filter_with_real_patterns()
+    test_word_boundary_matching()
+    test_message_result_cache()
+    test_batch_skips_rejected_before_scan()
+    test_ng_word_reason_uses_list_order()
+    test_filter_result_access()
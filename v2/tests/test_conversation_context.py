@@ -6,6 +6,7 @@
 
 import sys
 import os
+import logging
 import time
 import threading
 
@@ -18,6 +19,9 @@ from v2.core.events import PrepareCommentResponse, CommentResponseReady
 
 print("=== 会話の連続性改善テスト ===")
 
+logger = logging.getLogger(__name__)
+
+
 def test_conversation_continuity():
     """話題の連続性テスト"""
     
@@ -149,6 +153,5 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         sys.exit(1)
\ No newline at end of file
@@ -5,6 +5,7 @@
 
 import sys
 import os
+import logging
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from v2.handlers.greeting_handler import GreetingHandler
@@ -12,6 +13,9 @@ from v2.core.event_queue import EventQueue
 from v2.core.events import PrepareEndingGreeting
 
 
+logger = logging.getLogger(__name__)
+
+
 def test_ending_greeting():
     """終了挨拶のテスト"""
     print("=== 終了挨拶テスト ===")
@@ -60,8 +64,7 @@ def test_ending_greeting():
         
     except Exception as e:
         print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
 
 
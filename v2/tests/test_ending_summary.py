@@ -5,6 +5,7 @@
 
 import sys
 import os
+import logging
 import time
 
 # パスを追加
@@ -25,6 +26,9 @@ from openai_adapter import OpenAIAdapter
 from config import config
 
 
+logger = logging.getLogger(__name__)
+
+
 def test_ending_greeting_to_summary_flow():
     """締めの挨拶から日次要約までのフローテスト"""
     print("=== 締めの挨拶→日次要約フローテスト ===")
@@ -147,8 +151,7 @@ def test_ending_greeting_to_summary_flow():
             
     except Exception as e:
         print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
 
 
@@ -238,6 +241,5 @@ if __name__ == "__main__":
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         sys.exit(1)
\ No newline at end of file
@@ -6,6 +6,7 @@
 
 import sys
 import os
+import logging
 import time
 import threading
 from unittest.mock import patch, MagicMock
@@ -21,6 +22,9 @@ from v2.core.test_mode import test_mode_manager, TestMode
 import queue
 
 
+logger = logging.getLogger(__name__)
+
+
 def test_ending_greeting_with_timeout():
     """終了挨拶のタイムアウト問題をテスト"""
     print("=== 終了挨拶タイムアウト問題調査 ===")
@@ -146,8 +150,7 @@ def test_ending_greeting_with_timeout():
         
     except Exception as e:
         print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
         
     finally:
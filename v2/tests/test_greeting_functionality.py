@@ -3,20 +3,20 @@
 挨拶機能のテストスクリプト
 """
 
+import queue
 import sys
 import os
+import logging
 import time
 
-# パスを追加
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
-
 from v2.core.event_queue import EventQueue
 from v2.core.events import InitialGreetingRequested, EndingGreetingRequested, AppStarted
 from v2.state.state_manager import StateManager
 from v2.controllers.main_controller import MainController
 from v2.handlers.greeting_handler import GreetingHandler
 
+logger = logging.getLogger(__name__)
+
 
 def test_greeting_handler():
     """GreetingHandlerの基本機能テスト"""
@@ -56,12 +56,11 @@ def test_initial_greeting_flow():
             while True:
                 item = event_queue.get_nowait()
                 queued_items.append(item)
-        except:
+        except queue.Empty:
             pass
         
         print(f"📦 キューに入った項目数: {len(queued_items)}")
-        for i, item in enumerate(queued_items):
-            print(f"   {i+1}. {type(item).__name__}")
+        print("   " + " | ".join(f"{i+1}.{type(it).__name__}" for i, it in enumerate(queued_items)))
         
         # InitialGreetingRequestedがあるか確認
         has_greeting_request = any(
@@ -78,8 +77,7 @@ def test_initial_greeting_flow():
             
     except Exception as e:
         print(f"❌ 開始時の挨拶フローテストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
 
 
@@ -108,12 +106,11 @@ def test_ending_greeting_flow():
             while True:
                 item = event_queue.get_nowait()
                 queued_items.append(item)
-        except:
+        except queue.Empty:
             pass
         
         print(f"📦 キューに入った項目数: {len(queued_items)}")
-        for i, item in enumerate(queued_items):
-            print(f"   {i+1}. {type(item).__name__}")
+        print("   " + " | ".join(f"{i+1}.{type(it).__name__}" for i, it in enumerate(queued_items)))
         
         # PrepareEndingGreetingがあるか確認
         has_prepare_greeting = any(
@@ -130,8 +127,7 @@ def test_ending_greeting_flow():
             
     except Exception as e:
         print(f"❌ 終了時の挨拶フローテストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         return False
 
 
@@ -188,42 +184,38 @@ def run_all_tests():
     print("🎬 挨拶機能テスト開始")
     print("=" * 60)
     
-    test_results = []
-    
-    # 1. GreetingHandlerの基本機能テスト
-    test_results.append(test_greeting_handler())
-    
-    # 2. プロンプトファイル確認
-    test_results.append(test_prompt_files())
-    
-    # 3. 開始時の挨拶フローテスト
-    test_results.append(test_initial_greeting_flow())
+    tests = [
+        ("GreetingHandler初期化", test_greeting_handler),   # 1. GreetingHandlerの基本機能テスト
+        ("プロンプトファイル確認", test_prompt_files),        # 2. プロンプトファイル確認
+        ("開始時の挨拶フロー", test_initial_greeting_flow),   # 3. 開始時の挨拶フローテスト
+        ("終了時の挨拶フロー", test_ending_greeting_flow),    # 4. 終了時の挨拶フローテスト
+    ]
     
-    # 4. 終了時の挨拶フローテスト
-    test_results.append(test_ending_greeting_flow())
+    # 致命的な失敗（インポートエラー等）以降のテストは実行せずに打ち切る
+    test_results = []
+    for _, test in tests:
+        result = test()
+        test_results.append(result)
+        if not result:
+            break
     
     # 結果サマリー
     print("\n" + "=" * 60)
     print("📊 テスト結果サマリー")
     print("=" * 60)
     
-    test_names = [
-        "GreetingHandler初期化",
-        "プロンプトファイル確認",
-        "開始時の挨拶フロー",
-        "終了時の挨拶フロー"
+    statuses = [
+        ("✅ 成功" if test_results[i] else "❌ 失敗") if i < len(test_results) else "⏭️  スキップ"
+        for i in range(len(tests))
     ]
-    
-    for i, (name, result) in enumerate(zip(test_names, test_results)):
-        status = "✅ 成功" if result else "❌ 失敗"
-        print(f"{name:20s}: {status}")
+    print("\n".join(f"{name:20s}: {status}" for (name, _), status in zip(tests, statuses)))
     
     passed_tests = sum(test_results)
-    total_tests = len(test_results)
+    total_tests = len(tests)
     
     print(f"\n📈 合計: {passed_tests}/{total_tests} テスト成功")
     
-    success = all(test_results)
+    success = passed_tests == total_tests
     
     if success:
         print("\n🎉 すべてのテストが成功しました！")
@@ -242,6 +234,5 @@ if __name__ == "__main__":
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         sys.exit(1)
\ No newline at end of file
@@ -5,11 +5,8 @@ import unittest
 import threading
 import time
 from unittest.mock import Mock, patch
-import sys
 import os
-
-# プロジェクトルートをパスに追加
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import logging
 
 from v2.core.event_queue import EventQueue
 from v2.core.events import (
@@ -20,6 +17,9 @@ from v2.controllers.main_controller import MainController
 from v2.handlers.mode_manager import ModeManager
 from v2.state.state_manager import StateManager, SystemState
 
+logger = logging.getLogger(__name__)
+
+
 class TestGreetingToThemeFlow(unittest.TestCase):
     """挨拶からテーマ読み上げへの流れをテストする"""
     
@@ -55,7 +55,6 @@ class TestGreetingToThemeFlow(unittest.TestCase):
         print(f"[TEST] Theme file path: {theme_path}")
         
         # ファイルの存在を確認
-        import os
         file_exists = os.path.exists(theme_path)
         print(f"[TEST] Theme file exists: {file_exists}")
         
@@ -89,20 +88,14 @@ class TestGreetingToThemeFlow(unittest.TestCase):
             print("[TEST] ✅ SpeechPlaybackCompleted handled successfully")
         except Exception as e:
             print(f"[TEST] ❌ Error handling SpeechPlaybackCompleted: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("テスト実行中に例外が発生しました")
         
         print(f"[TEST] Current state after: {self.state_manager.current_state}")
         
         # イベントキューに何が追加されたかチェック
-        events_in_queue = []
-        try:
-            while True:
-                event = self.event_queue.get(timeout=0.1)
-                events_in_queue.append(event)
-                print(f"[TEST] Event in queue: {type(event).__name__}")
-        except:
-            pass
+        # ハンドラーは同期的にキューへ積むので、待たずに一括で取り出す
+        events_in_queue = self.event_queue.drain_nowait()
+        print("[TEST] Events in queue: " + " | ".join(type(e).__name__ for e in events_in_queue))
         
         print(f"[TEST] Total events generated: {len(events_in_queue)}")
         
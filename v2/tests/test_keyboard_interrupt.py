@@ -6,19 +6,20 @@ Ctrl+Cで正常にシステムが停止するかを確認
 
 import sys
 import os
+import logging
 import time
 import signal
 import threading
 
-# プロジェクトルートをパスに追加
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from v2.core.event_queue import EventQueue
 from v2.state.state_manager import StateManager
 from v2.services.integrated_comment_manager import IntegratedCommentManager
 
 print("=== KeyboardInterrupt機能テスト ===")
 
+logger = logging.getLogger(__name__)
+
+
 def test_keyboard_interrupt():
     """KeyboardInterrupt処理のテスト"""
     
@@ -55,14 +56,13 @@ def test_keyboard_interrupt():
         print("="*60)
         print("⌨️  Ctrl+C を押してシステムを停止してください")
         print("⏱️  10秒後に自動停止します")
-        print("🔍 応答性をテスト中...")
+        print("🔍 応答性をテスト中... (待機中)")
         
         start_time = time.time()
         while state_manager.is_running and (time.time() - start_time) < 10:
             try:
                 # 短いタイムアウトでキューチェック
                 time.sleep(0.1)
-                print(".", end="", flush=True)
             except KeyboardInterrupt:
                 print("\n✅ KeyboardInterrupt捕捉成功！")
                 break
@@ -95,6 +95,5 @@ if __name__ == "__main__":
         test_keyboard_interrupt()
     except Exception as e:
         print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("テスト実行中に例外が発生しました")
         sys.exit(1)
\ No newline at end of file
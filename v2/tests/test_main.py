@@ -60,15 +60,14 @@ def test_main(argv=None):
     # テストモード設定を表示
     if test_mode_manager.is_test_mode():
         config = test_mode_manager.get_config()
-        print("[TestMode] Configuration:")
-        print(f"  - Mock OpenAI: {config.use_mock_openai}")
-        print(f"  - Mock Audio: {config.use_mock_audio}")
-        print(f"  - Mock YouTube: {config.use_mock_youtube}")
-        print(
-            f"  - Auto Stop: {config.auto_stop_enabled} "
-            f"({config.max_runtime_minutes}min)"
-        )
-        print(f"  - Dummy Comments: {config.dummy_comments_enabled}")
+        print("\n".join([
+            "[TestMode] Configuration:",
+            f"  - Mock OpenAI: {config.use_mock_openai}",
+            f"  - Mock Audio: {config.use_mock_audio}",
+            f"  - Mock YouTube: {config.use_mock_youtube}",
+            f"  - Auto Stop: {config.auto_stop_enabled} ({config.max_runtime_minutes}min)",
+            f"  - Dummy Comments: {config.dummy_comments_enabled}",
+        ]))
 
     # グローバル変数で参照可能にする
     global state_manager, audio_manager
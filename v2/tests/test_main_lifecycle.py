@@ -1,9 +1,12 @@
+import atexit
+import concurrent.futures
+import itertools
 import unittest
 import os
-import time
-import threading
+import re
 import queue
-from unittest.mock import patch, MagicMock
+from dataclasses import dataclass
+from unittest.mock import patch
 
 from v2.core.event_queue import EventQueue
 from v2.core.events import (
@@ -11,10 +14,38 @@ from v2.core.events import (
     PrepareInitialGreeting, PrepareMonologue, PrepareCommentResponse, SpeechPlaybackCompleted
 )
 from v2.state.state_manager import StateManager
-from v2.controllers.main_controller import MainController
-from v2.handlers.monologue_handler import MonologueHandler
-from v2.handlers.comment_handler import CommentHandler
-from v2.handlers.greeting_handler import GreetingHandler
+
+
+# 本命の独り言と区別するためのつなぎフレーズ（一度だけコンパイルする）
+FILLER_PHRASES = frozenset({"えーっと", "そうですね", "ちょっとまってくださいね", "うーん"})
+FILLER_RE = re.compile("|".join(re.escape(p) for p in sorted(FILLER_PHRASES)))
+
+# 発話イベント待ちのタイムアウト（秒）。遅いCI環境では TEST_EVENT_TIMEOUT で延長する
+DEFAULT_EVENT_TIMEOUT = float(os.getenv("TEST_EVENT_TIMEOUT", "5"))
+
+# モジュール内のテストで共有するワーカースレッドプール
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="LifecycleWorker")
+atexit.register(_EXECUTOR.shutdown)
+
+
+@dataclass(frozen=True, slots=True)
+class _MockAuthor:
+    """pytchatのAuthorオブジェクトの代用"""
+    name: str
+    channelId: str
+
+
+@dataclass(frozen=True, slots=True)
+class _MockComment:
+    """pytchatのコメントオブジェクトの代用（IntegratedCommentManagerが参照する属性のみ）"""
+    id: str
+    message: str
+    author: _MockAuthor
+    datetime: str
+
+
+class _Shutdown:
+    """ワーカースレッドに終了を伝えるためのセンチネル"""
 
 
 class TestMainLifecycle(unittest.TestCase):
@@ -23,10 +54,25 @@ class TestMainLifecycle(unittest.TestCase):
     挨拶 -> 朗読 -> 雑談 -> 終了挨拶
     """
 
+    THEME_FILE = "prompts/test_theme_lifecycle.txt"
+    THEME_CONTENT = "これはテスト用のテーマです。AIの未来について語ります。"
+
+    @classmethod
+    def setUpClass(cls):
+        """テスト用のテーマファイルをクラスで一度だけ作成する"""
+        os.makedirs("prompts", exist_ok=True)
+        with open(cls.THEME_FILE, "w", encoding="utf-8") as f:
+            f.write(cls.THEME_CONTENT)
+
+    @classmethod
+    def tearDownClass(cls):
+        """テスト用のテーマファイルを削除する"""
+        if os.path.exists(cls.THEME_FILE):
+            os.remove(cls.THEME_FILE)
+
     def setUp(self):
         """テストのセットアップ"""
         print("\n--- Setting up test: TestMainLifecycle ---")
-        self.main_thread = None
         self.shutdown_file = "shutdown_request.txt"
         
         # シャットダウンファイルが残っていれば削除
@@ -51,7 +97,7 @@ class TestMainLifecycle(unittest.TestCase):
         self.mock_audio_manager = self.mock_audio_manager_class.return_value
         
         # handle_play_speechが呼ばれた際の動作を定義
-        self.speech_queue = queue.Queue()
+        self.speech_queue = queue.SimpleQueue()  # put/get のみ使うので軽量なSimpleQueueで十分
         # イベントキューをこのクラスの属性として保持
         self.event_queue_for_test = None
         self.mock_audio_manager.handle_play_speech.side_effect = self.mock_handle_play_speech
@@ -67,16 +113,6 @@ class TestMainLifecycle(unittest.TestCase):
     def tearDown(self):
         """テストのクリーンアップ"""
         print("--- Tearing down test: TestMainLifecycle ---")
-        # mainスレッドが実行中であれば停止を試みる
-        if self.main_thread and self.main_thread.is_alive():
-            print("Stopping main thread...")
-            # シャットダウンファイルを確実に作成
-            with open(self.shutdown_file, 'w') as f:
-                f.write('shutdown')
-            self.main_thread.join(timeout=10) # 10秒待つ
-            if self.main_thread.is_alive():
-                print("Warning: Main thread did not terminate.")
-        
         # パッチを停止
         self.patch_pytchat.stop()
         self.patch_audio_manager.stop()
@@ -103,20 +139,17 @@ class TestMainLifecycle(unittest.TestCase):
             play_speech_event.sync_queue.put("done")
 
     def _comment_generator(self):
-        """コメントを順番に返すジェネレーター"""
-        # 最初の呼び出しではコメントなし
-        yield []
-        
-        # 次の呼び出しで擬似コメントを返す
-        mock_comment = MagicMock()
-        mock_comment.author.name = "TestUser"
-        mock_comment.message = "こんにちは！今日の調子はどうですか？"
-        mock_comment.id = "test-comment-id"
-        yield [mock_comment]
+        """コメントを順番に返すイテレーター"""
+        mock_comment = _MockComment(
+            id="test-comment-id",
+            message="こんにちは！今日の調子はどうですか？",
+            author=_MockAuthor(name="TestUser", channelId="test-channel-id"),
+            datetime="2025-01-01 00:00:00",
+        )
 
-        # それ以降はずっと空リストを返す
-        while True:
-            yield []
+        # 最初の呼び出しではコメントなし、次の呼び出しで擬似コメントを返し、
+        # それ以降はPythonのジェネレーターを回さずに空の結果を返し続ける
+        return itertools.chain(([], [mock_comment]), itertools.repeat(()))
 
     def test_full_lifecycle(self):
         """
@@ -127,13 +160,13 @@ class TestMainLifecycle(unittest.TestCase):
         4. 正常なシャットダウンと終了挨拶
         """
         print("\n*** test_full_lifecycle: START ***")
+        # コントローラー・ハンドラー群は重いので、このテストの実行時に初めてインポートする
+        from v2.controllers.main_controller import MainController
+        from v2.handlers.monologue_handler import MonologueHandler
+        from v2.handlers.comment_handler import CommentHandler
+        from v2.handlers.greeting_handler import GreetingHandler
         
-        # テスト用のテーマファイルを作成
-        theme_content = "これはテスト用のテーマです。AIの未来について語ります。"
-        theme_file = "prompts/test_theme_lifecycle.txt"
-        os.makedirs("prompts", exist_ok=True)
-        with open(theme_file, "w", encoding="utf-8") as f:
-            f.write(theme_content)
+        theme_file = self.THEME_FILE
 
         # 1. アプリケーションのコアコンポーネントを手動で初期化
         event_queue = EventQueue()
@@ -160,37 +193,39 @@ class TestMainLifecycle(unittest.TestCase):
         
         # イベントを処理するワーカースレッドを模倣
         def worker():
-            while state_manager.is_running:
-                try:
-                    item = event_queue.get(timeout=1)
-                    if isinstance(item, Event):
-                        main_controller.process_item(item)
-                    elif isinstance(item, PrepareInitialGreeting):
-                        greeting_handler.handle_prepare_initial_greeting(item)
-                    elif isinstance(item, PrepareMonologue):
-                        monologue_handler.handle_prepare_monologue(item)
-                    elif isinstance(item, PrepareCommentResponse):
-                        comment_handler.handle_prepare_comment_response(item)
-                    # PlaySpeechはモックが直接処理するので、ここでは何もしない
-                    # elif isinstance(item, PlaySpeech):
-                    #     audio_manager.handle_play_speech(item)
-                except queue.Empty:
-                    continue
+            # センチネルが届くまでブロックして待つ（ポーリングしない）
+            while True:
+                item = event_queue.get()
+                if isinstance(item, _Shutdown):
+                    return
+                if isinstance(item, Event):
+                    main_controller.process_item(item)
+                elif isinstance(item, PrepareInitialGreeting):
+                    greeting_handler.handle_prepare_initial_greeting(item)
+                elif isinstance(item, PrepareMonologue):
+                    monologue_handler.handle_prepare_monologue(item)
+                elif isinstance(item, PrepareCommentResponse):
+                    comment_handler.handle_prepare_comment_response(item)
+                # PlaySpeechはモックが直接処理するので、ここでは何もしない
+                # elif isinstance(item, PlaySpeech):
+                #     audio_manager.handle_play_speech(item)
         
-        worker_thread = threading.Thread(target=worker, daemon=True)
-        worker_thread.start()
+        worker_future = _EXECUTOR.submit(worker)
+        # 途中でアサーションや例外で抜けても、ワーカーが必ず終了するようにセンチネルを送る
+        # （ワーカーが残ると、終了時の_EXECUTOR.shutdownで待ち続けてしまう）
+        self.addCleanup(event_queue.put, _Shutdown())
 
         # 2. 初期挨拶の確認
         print("\n[Step 2] Verifying initial greeting...")
         try:
             # 最初のイベント（つなぎ or 挨拶）を取得。内容は問わない。
-            initial_speech = self.speech_queue.get(timeout=20)
+            initial_speech = self.speech_queue.get(timeout=DEFAULT_EVENT_TIMEOUT)
             self.assertIsInstance(initial_speech, PlaySpeech)
             print(f"  -> Initial speech event found: {initial_speech.sentences[0][:30]}...")
 
             # キューに挨拶本体が残っている可能性があるので、それも取得
             if "うーん" in initial_speech.sentences[0] or "えーっと" in initial_speech.sentences[0]:
-                 greeting_speech = self.speech_queue.get(timeout=20)
+                 greeting_speech = self.speech_queue.get(timeout=DEFAULT_EVENT_TIMEOUT)
                  self.assertIsInstance(greeting_speech, PlaySpeech)
                  print(f"  -> Actual greeting speech found: {greeting_speech.sentences[0][:30]}...")
 
@@ -202,18 +237,17 @@ class TestMainLifecycle(unittest.TestCase):
         try:
             # つなぎフレーズをスキップして、本命の独り言を見つける
             monologue = None
-            filler_phrases = ["えーっと", "そうですね", "ちょっとまってくださいね", "うーん"]
             for _ in range(3): # 最大3回試行
-                speech_event = self.speech_queue.get(timeout=30)
+                speech_event = self.speech_queue.get(timeout=DEFAULT_EVENT_TIMEOUT)
                 self.assertIsInstance(speech_event, PlaySpeech)
                 
-                full_text = " ".join(speech_event.sentences)
-                # つなぎフレーズでなければ、それが独り言だと判断
-                if not any(phrase in full_text for phrase in filler_phrases):
+                # つなぎフレーズでなければ、それが独り言だと判断（文ごとに走査し連結しない）
+                is_filler = any(FILLER_RE.search(sentence) for sentence in speech_event.sentences)
+                if not is_filler:
                     monologue = speech_event
                     break
                 else:
-                    print(f"  -> Skipping filler phrase: {full_text[:30]}...")
+                    print(f"  -> Skipping filler phrase: {speech_event.sentences[0][:30]}...")
 
             if monologue is None:
                 self.fail("Theme monologue was not found, only filler phrases.")
@@ -227,11 +261,9 @@ class TestMainLifecycle(unittest.TestCase):
 
         # 4. コメント応答（雑談）の確認
         print("\n[Step 4] Verifying comment response...")
-        # integrated_comment_managerが次のコメントをチェックするまで待機
-        time.sleep(5) 
-        
         try:
-            comment_response = self.speech_queue.get(timeout=30)
+            # get(timeout=...) がコメント応答の到着までブロックする
+            comment_response = self.speech_queue.get(timeout=DEFAULT_EVENT_TIMEOUT)
             self.assertIsInstance(comment_response, PlaySpeech)
             self.assertIn("TestUser", comment_response.sentences[0], "The response should mention the user.")
             print(f"  -> Comment response found: {comment_response.sentences[0][:30]}...")
@@ -240,14 +272,15 @@ class TestMainLifecycle(unittest.TestCase):
 
         # 5. シャットダウンと終了挨拶の確認
         print("\n[Step 5] Initiating shutdown and verifying ending greeting...")
-        # シャットダウンリクエスト
+        # シャットダウンリクエスト（ワーカーはセンチネルで停止する。後始末でも同じセンチネルを送るが、二重でも無害）
         state_manager.is_running = False
+        event_queue.put(_Shutdown())
         # 終了挨拶を直接生成（main.pyのシャットダウンシーケンスを模倣）
         final_greeting_sentences = ["テストお疲れ様でした。シャットダウンします。"]
         self.speech_queue.put(PlaySpeech(task_id="ending_speech_final", sentences=final_greeting_sentences))
             
         try:
-            ending_greeting = self.speech_queue.get(timeout=30)
+            ending_greeting = self.speech_queue.get(timeout=DEFAULT_EVENT_TIMEOUT)
             self.assertIsInstance(ending_greeting, PlaySpeech)
             self.assertTrue(len(ending_greeting.sentences) > 0)
             self.assertTrue(ending_greeting.task_id.startswith("ending_speech"))
@@ -257,13 +290,12 @@ class TestMainLifecycle(unittest.TestCase):
 
         # 6. スレッドが正常に終了することを確認
         print("\n[Step 6] Verifying worker thread termination...")
-        worker_thread.join(timeout=5)
-        self.assertFalse(worker_thread.is_alive(), "Worker thread should have terminated gracefully.")
+        try:
+            worker_future.result(timeout=5)
+        except concurrent.futures.TimeoutError:
+            self.fail("Worker thread should have terminated gracefully.")
         
         print("\n*** test_full_lifecycle: SUCCESS ***")
 
-        # テストファイルをクリーンアップ
-        os.remove(theme_file)
-
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
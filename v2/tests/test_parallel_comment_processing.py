@@ -13,20 +13,16 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
 
-from v2.core.event_queue import EventQueue
 from v2.core.events import AppStarted, NewCommentReceived, SpeechPlaybackCompleted
-from v2.state.state_manager import StateManager, SystemState
-from v2.controllers.main_controller import MainController
+from v2.state.state_manager import SystemState
 
 
-def test_parallel_comment_processing():
+def test_parallel_comment_processing(clean_controller_stack):
     """並行コメント処理のテスト"""
     print("=== 並行コメント処理テスト ===")
     
-    # 1. コンポーネント初期化
-    event_queue = EventQueue()
-    state_manager = StateManager()
-    main_controller = MainController(event_queue, state_manager)
+    # 1. コンポーネント初期化（conftest.py の共有スタックを初期状態に戻して使う）
+    event_queue, state_manager, main_controller = clean_controller_stack
     
     print("✅ コンポーネント初期化完了")
     
@@ -62,16 +58,10 @@ def test_parallel_comment_processing():
     # 6. 結果確認
     print(f"📊 処理後システム状態: {state_manager.current_state.value}")
     print(f"📝 保留中コメント数: {len(state_manager.pending_comments)}")
-    print(f"🎯 生成済み応答数: {len(getattr(state_manager, 'prepared_responses', []))}")
+    print(f"🎯 生成済み応答数: {len(state_manager.prepared_responses)}")
     
     # 7. イベントキューに並行処理コマンドが入っているか確認
-    queued_items = []
-    try:
-        while True:
-            item = event_queue.get_nowait()
-            queued_items.append(item)
-    except:
-        pass
+    queued_items = event_queue.drain_nowait()
     
     print(f"📦 キューに入った項目数: {len(queued_items)}")
     for i, item in enumerate(queued_items):
@@ -86,13 +76,7 @@ def test_parallel_comment_processing():
     print(f"🎯 生成済み応答の確認: {state_manager.has_prepared_responses()}")
     
     # 9. 追加でキューに入った項目を確認
-    additional_items = []
-    try:
-        while True:
-            item = event_queue.get_nowait()
-            additional_items.append(item)
-    except:
-        pass
+    additional_items = event_queue.drain_nowait()
     
     print(f"📦 追加キュー項目数: {len(additional_items)}")
     for i, item in enumerate(additional_items):
@@ -111,16 +95,5 @@ def test_parallel_comment_processing():
     print(f"コマンドキューイング: {'✅' if len(queued_items) > 0 else '❌'}")
     print(f"状態管理: {'✅' if state_manager.current_state != SystemState.SPEAKING else '❌'}")
     
-    return success
+    assert success, "発話中のコメントに対する並行処理コマンドがキューに入っていません"
 
-
-if __name__ == "__main__":
-    try:
-        success = test_parallel_comment_processing()
-        print(f"\n🏁 {'テスト成功！' if success else 'テスト失敗'}")
-        sys.exit(0 if success else 1)
-    except Exception as e:
-        print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
@@ -8,15 +8,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from v2.handlers.master_prompt_manager import MasterPromptManager
 
-
-def test_persona_data_loading():
+def test_persona_data_loading(master_prompt_manager):
     """人格データ読み込みのテスト"""
     print("=== 人格データ読み込みテスト ===")
     
-    # MasterPromptManagerインスタンスを作成
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # 人格データの統計情報を取得
     stats = manager.get_persona_statistics()
@@ -29,14 +26,14 @@ def test_persona_data_loading():
     print(f"  ファイルパス: {stats['file_path']}")
     print("")
     
-    return stats['loaded']
+    assert stats['loaded'], "人格データの読み込みに失敗しました"
 
 
-def test_keyword_extraction():
+def test_keyword_extraction(master_prompt_manager):
     """キーワード抽出機能のテスト"""
     print("=== キーワード抽出テスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # テスト用のタスク指示
     test_tasks = [
@@ -54,11 +51,11 @@ def test_keyword_extraction():
         print("")
 
 
-def test_persona_info_extraction():
+def test_persona_info_extraction(master_prompt_manager):
     """人格情報抽出機能のテスト"""
     print("=== 人格情報抽出テスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # テスト用のタスク指示
     test_tasks = [
@@ -85,11 +82,11 @@ def test_persona_info_extraction():
         print("")
 
 
-def test_integrated_prompt_building():
+def test_integrated_prompt_building(master_prompt_manager):
     """統合プロンプト構築のテスト"""
     print("=== 統合プロンプト構築テスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # テスト用のタスク指示
     task_instruction = "視聴者からの質問「ハヤテさんの配信で一番大切にしていることは何ですか？」に答えてください。"
@@ -117,11 +114,11 @@ def test_integrated_prompt_building():
     print(f"プロンプト長: {len(integrated_prompt):,} 文字")
 
 
-def test_persona_reload():
+def test_persona_reload(master_prompt_manager):
     """人格データ再読み込みのテスト"""
     print("=== 人格データ再読み込みテスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     print("初期状態:")
     initial_stats = manager.get_persona_statistics()
@@ -134,61 +131,6 @@ def test_persona_reload():
     reloaded_stats = manager.get_persona_statistics()
     print(f"  サイズ: {reloaded_stats['size']:,} 文字")
     
-    success = reloaded_stats['size'] == initial_stats['size']
-    print(f"再読み込み結果: {'✅ 成功' if success else '❌ 失敗'}")
-
-
-def main():
-    """メイン実行関数"""
-    print("🧪 人格プロンプト統合機能テスト開始")
-    print("=" * 70)
-    
-    try:
-        # 各テストを順次実行
-        tests = [
-            ("人格データ読み込み", test_persona_data_loading),
-            ("キーワード抽出", test_keyword_extraction),
-            ("人格情報抽出", test_persona_info_extraction),
-            ("統合プロンプト構築", test_integrated_prompt_building),
-            ("人格データ再読み込み", test_persona_reload),
-        ]
-        
-        passed_tests = 0
-        for test_name, test_func in tests:
-            try:
-                print(f"\n📋 {test_name}テスト実行中...")
-                result = test_func()
-                if result is not False:  # Noneや他の値も成功とみなす
-                    passed_tests += 1
-                    print(f"✅ {test_name}テスト完了")
-                else:
-                    print(f"❌ {test_name}テスト失敗")
-            except Exception as e:
-                print(f"❌ {test_name}テストでエラー: {e}")
-        
-        # 結果サマリー
-        print("\n" + "=" * 70)
-        print("📊 テスト結果サマリー")
-        print("=" * 70)
-        print(f"実行テスト数: {len(tests)}")
-        print(f"成功: {passed_tests}")
-        print(f"失敗: {len(tests) - passed_tests}")
-        
-        if passed_tests == len(tests):
-            print("\n🎉 すべてのテストが成功しました！")
-            print("✅ 人格プロンプト統合機能が正常に動作しています")
-        else:
-            print(f"\n⚠️  {len(tests) - passed_tests}個のテストが失敗しました")
-        
-        return passed_tests == len(tests)
-        
-    except Exception as e:
-        print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
+    assert reloaded_stats['size'] == initial_stats['size'], "再読み込み前後でサイズが変わりました"
+    print("再読み込み結果: ✅ 成功")
 
-if __name__ == "__main__":
-    success = main()
-    exit(0 if success else 1)
\ No newline at end of file
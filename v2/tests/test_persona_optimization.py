@@ -8,14 +8,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from v2.handlers.master_prompt_manager import MasterPromptManager
 
-
-def test_context_optimization():
+def test_context_optimization(master_prompt_manager):
     """コンテキスト最適化のテスト"""
     print("=== コンテキスト最適化テスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # さまざまなタイプのタスクでテスト
     test_tasks = [
@@ -56,6 +54,7 @@ def test_context_optimization():
         print(f"  文字数: {char_count} 文字")
         print(f"  エントリー数: {line_count} 個")
         print(f"  制限内か: {'✅' if char_count <= 800 else '❌'}")
+        assert char_count <= 800, f"{test_case['name']}: 人格情報が800文字を超えています（{char_count}文字）"
         
         # 内容のプレビュー（最初の200文字）
         preview = persona_info[:200] + "..." if len(persona_info) > 200 else persona_info
@@ -65,11 +64,11 @@ def test_context_optimization():
                 print(f"    {line}")
 
 
-def test_entry_prioritization():
+def test_entry_prioritization(master_prompt_manager):
     """エントリー優先度付けのテスト"""
     print("\n=== エントリー優先度付けテスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     # テスト用のエントリーリスト
     test_entries = [
@@ -94,23 +93,25 @@ def test_entry_prioritization():
     total_chars = sum(len(entry) for entry in optimized_entries)
     print(f"  総文字数: {total_chars} 文字")
     print(f"  制限内か: {'✅' if total_chars <= 800 else '❌'}")
+    assert total_chars <= 800, f"最適化後のエントリーが800文字を超えています（{total_chars}文字）"
     
     print(f"\n選択されたエントリー:")
     for i, entry in enumerate(optimized_entries, 1):
         print(f"  {i}. {entry[:80]}{'...' if len(entry) > 80 else ''}")
 
 
-def test_essential_info():
+def test_essential_info(master_prompt_manager):
     """必要最小限情報の取得テスト"""
     print("\n=== 必要最小限情報テスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     essential_info = manager._get_essential_persona_info()
     
     print(f"必要最小限情報:")
     print(f"  文字数: {len(essential_info)} 文字")
     print(f"  制限内か: {'✅' if len(essential_info) <= 300 else '❌'}")
+    assert len(essential_info) <= 300, f"必要最小限情報が300文字を超えています（{len(essential_info)}文字）"
     
     print(f"\n内容:")
     for line in essential_info.split('\n'):
@@ -118,11 +119,11 @@ def test_essential_info():
             print(f"  {line}")
 
 
-def test_integrated_prompt_size():
+def test_integrated_prompt_size(master_prompt_manager):
     """統合プロンプトサイズのテスト"""
     print("\n=== 統合プロンプトサイズテスト ===")
     
-    manager = MasterPromptManager()
+    manager = master_prompt_manager
     
     test_cases = [
         {
@@ -171,35 +172,3 @@ def test_integrated_prompt_size():
             
         print(f"  ステータス: {status}")
 
-
-def main():
-    """メイン実行関数"""
-    print("🧪 人格プロンプト最適化機能テスト開始")
-    print("=" * 70)
-    
-    try:
-        # 各テストを実行
-        test_context_optimization()
-        test_entry_prioritization() 
-        test_essential_info()
-        test_integrated_prompt_size()
-        
-        print("\n" + "=" * 70)
-        print("📊 最適化テスト完了")
-        print("=" * 70)
-        print("✅ コンテキスト最適化機能が正常に動作しています")
-        print("✅ 人格データは適切にサイズ制限されています")
-        print("✅ 統合プロンプトのトークン使用量が最適化されています")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ テスト実行エラー: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
-if __name__ == "__main__":
-    success = main()
-    exit(0 if success else 1)
\ No newline at end of file
@@ -5,31 +5,28 @@
 
 import sys
 import os
+import concurrent.futures
 import time
-import threading
 
-# プロジェクトルートをパスに追加
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import pytest
 
 from v2.core.event_queue import EventQueue
 from v2.handlers.daily_summary_handler import DailySummaryHandler
 from v2.core.events import StreamEnded, DailySummaryReady
-from memory_manager import MemoryManager
 
 print("=== 配信終了後サマリー生成テスト ===")
 
-def test_post_stream_summary():
+
+def test_post_stream_summary(request):
     """配信終了後のサマリー生成テスト"""
     
     # システム初期化
     event_queue = EventQueue()
     
-    # MemoryManagerを初期化（サマリー生成に必要）
+    # MemoryManagerを初期化（サマリー生成に必要。conftest.py のセッション共有フィクスチャを使う）
+    # 初期化に失敗してもMemoryManagerなしで続けるため、フィクスチャは引数ではなくここで取り出す
     try:
-        from openai_adapter import OpenAIAdapter
-        system_prompt = "システムプロンプト"
-        openai_adapter = OpenAIAdapter(system_prompt, silent_mode=True)
-        memory_manager = MemoryManager(openai_adapter)
+        memory_manager = request.getfixturevalue("memory_manager")
         print("✅ MemoryManager初期化成功")
     except Exception as e:
         print(f"⚠️ MemoryManager初期化失敗: {e}")
@@ -48,42 +45,28 @@ def test_post_stream_summary():
     print(f"   配信時間: {stream_end_event.stream_duration_minutes}分")
     print(f"   終了理由: {stream_end_event.ending_reason}")
     
-    # 応答監視
-    summary_completed = False
-    summary_result = None
-    processing_completed = threading.Event()
+    # 応答監視（DailySummaryReadyがputされた時点で結果をセットする）
+    summary_future = concurrent.futures.Future()
     
-    def monitor_summary():
-        nonlocal summary_completed, summary_result
-        timeout = 60  # 60秒でタイムアウト
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            try:
-                item = event_queue.get_nowait()
-                if isinstance(item, DailySummaryReady):
-                    summary_result = item
-                    summary_completed = True
-                    processing_completed.set()
-                    return
-            except:
-                pass
-            time.sleep(0.5)
-        
-        print("⏰ サマリー生成タイムアウト")
-        processing_completed.set()
+    def on_summary_ready(item):
+        if not summary_future.done():
+            summary_future.set_result(item)
     
-    # 監視開始
-    monitor_thread = threading.Thread(target=monitor_summary, daemon=True)
-    monitor_thread.start()
+    event_queue.register_type_callback(DailySummaryReady, on_summary_ready)
     
     # 配信終了イベントを処理
-    test_start = time.time()
+    test_start_ns = time.perf_counter_ns()
     summary_handler.handle_stream_ended(stream_end_event)
     
-    # 完了待機
-    processing_completed.wait()
-    test_duration = time.time() - test_start
+    # 完了待機（60秒でタイムアウト）
+    try:
+        summary_result = summary_future.result(timeout=60)
+        summary_completed = True
+    except concurrent.futures.TimeoutError:
+        print("⏰ サマリー生成タイムアウト")
+        summary_result = None
+        summary_completed = False
+    test_duration = (time.perf_counter_ns() - test_start_ns) / 1e9
     
     # 結果表示
     print("\n" + "="*60)
@@ -123,21 +106,12 @@ def test_post_stream_summary():
     for improvement in improvements:
         print(f"   {improvement}")
     
+    print(f"\n🎯 総合評価: {'成功' if summary_completed else '要改善'}")
     return summary_completed
 
 if __name__ == "__main__":
     # 環境変数設定
     os.environ['CHAT_TEST_MODE'] = 'true'
     
-    try:
-        success = test_post_stream_summary()
-        print(f"\n🎯 総合評価: {'成功' if success else '要改善'}")
-        sys.exit(0 if success else 1)
-    except KeyboardInterrupt:
-        print("\n⏹️  テスト中断")
-        sys.exit(1)
-    except Exception as e:
-        print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+    # フィクスチャを使うため pytest 経由で実行する（-s で途中経過をそのまま表示する）
+    sys.exit(pytest.main([__file__, "-s"]))
\ No newline at end of file
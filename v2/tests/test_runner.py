@@ -7,22 +7,49 @@
 
 import sys
 import os
+import logging
 import argparse
 import time
 import signal
-from typing import Optional
+from typing import Any, Dict, Optional
 
 # プロジェクトルートをパスに追加
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from v2.core.test_mode import test_mode_manager, TestMode
+logger = logging.getLogger(__name__)
+
+# サブコマンド名 -> (TestModeのメンバー名, 見出し, 追加設定, 開始時の案内)
+# TestModeは実行時まで読み込まないため、メンバー名で持つ
+_MODE_SPECS = {
+    'unit': ("UNIT", "Unit Test Mode", None, ""),
+    'integration': ("INTEGRATION", "Integration Test Mode", None, ""),
+    'demo': ("DEMO", "Demo Mode", None, ""),
+    'debug': ("DEBUG", "Debug Mode", None, ""),
+    # 短時間のユニットテストモードで、手動停止(Ctrl+C)を確認する
+    'keyboard-test': (
+        "UNIT",
+        "Keyboard Interrupt Test",
+        {
+            'max_runtime_minutes': 1,
+            'auto_stop_enabled': False,  # 手動停止テストのため
+            'dummy_comment_interval': 2.0,
+            'verbose_logging': True
+        },
+        "⌨️  Ctrl+C を押して停止テストを実行してください\n⏱️  60秒後に自動停止します",
+    ),
+}
 
 
 class TestRunner:
     """テスト実行管理クラス"""
     
     def __init__(self):
-        self.start_time = time.time()
+        # テストモード管理は実行時に初めて読み込む（--help や引数エラーでは読み込まない）
+        from v2.core.test_mode import test_mode_manager, TestMode
+        self.test_mode_manager = test_mode_manager
+        self.test_modes = TestMode
+        
+        self.start_time_ns = time.perf_counter_ns()  # 経過時間の計測用（単調増加）
         self.running = True
         
         # シグナルハンドラー設定
@@ -33,68 +60,24 @@ class TestRunner:
         """シグナル受信時の処理"""
         print(f"\n[TestRunner] Signal {signum} received. Shutting down...")
         self.running = False
-        test_mode_manager.shutdown()
+        self.test_mode_manager.shutdown()
         sys.exit(0)
     
-    def run_unit_test(self, duration_minutes: Optional[int] = None):
-        """ユニットテストモードで実行"""
-        print("=== Unit Test Mode ===")
+    def run(self, mode_name: str, title: str, duration_minutes: Optional[int] = None,
+            extra_config: Optional[Dict[str, Any]] = None, notice: str = ""):
+        """指定したテストモードでシステムを実行"""
+        print(f"=== {title} ===")
         
         custom_config = {}
         if duration_minutes:
             custom_config['max_runtime_minutes'] = duration_minutes
             custom_config['auto_stop_enabled'] = True
+        if extra_config:
+            custom_config.update(extra_config)
         
-        test_mode_manager.set_mode(TestMode.UNIT, custom_config)
-        self._run_main_system()
-    
-    def run_integration_test(self, duration_minutes: Optional[int] = None):
-        """統合テストモードで実行"""
-        print("=== Integration Test Mode ===")
-        
-        custom_config = {}
-        if duration_minutes:
-            custom_config['max_runtime_minutes'] = duration_minutes
-            custom_config['auto_stop_enabled'] = True
-        
-        test_mode_manager.set_mode(TestMode.INTEGRATION, custom_config)
-        self._run_main_system()
-    
-    def run_demo_mode(self, duration_minutes: Optional[int] = None):
-        """デモモードで実行"""
-        print("=== Demo Mode ===")
-        
-        custom_config = {}
-        if duration_minutes:
-            custom_config['max_runtime_minutes'] = duration_minutes
-            custom_config['auto_stop_enabled'] = True
-        
-        test_mode_manager.set_mode(TestMode.DEMO, custom_config)
-        self._run_main_system()
-    
-    def run_debug_mode(self):
-        """デバッグモードで実行"""
-        print("=== Debug Mode ===")
-        
-        test_mode_manager.set_mode(TestMode.DEBUG)
-        self._run_main_system()
-    
-    def run_keyboard_interrupt_test(self):
-        """KeyboardInterrupt機能テスト"""
-        print("=== Keyboard Interrupt Test ===")
-        
-        # 短時間のユニットテストモードで実行
-        custom_config = {
-            'max_runtime_minutes': 1,
-            'auto_stop_enabled': False,  # 手動停止テストのため
-            'dummy_comment_interval': 2.0,
-            'verbose_logging': True
-        }
-        
-        test_mode_manager.set_mode(TestMode.UNIT, custom_config)
-        
-        print("⌨️  Ctrl+C を押して停止テストを実行してください")
-        print("⏱️  60秒後に自動停止します")
+        self.test_mode_manager.set_mode(self.test_modes[mode_name], custom_config or None)
+        if notice:
+            print(notice)
         
         self._run_main_system()
     
@@ -105,7 +88,7 @@ class TestRunner:
             from test_main import test_main
             print(
                 "[TestRunner] Starting test main system in "
-                f"{test_mode_manager.get_mode().value} mode..."
+                f"{self.test_mode_manager.get_mode().value} mode..."
             )
             test_main([])  # 引数なしでtest_mainを呼び出す
             
@@ -114,17 +97,16 @@ class TestRunner:
             
         except Exception as e:
             print(f"[TestRunner] Error running main system: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("テスト実行中に例外が発生しました")
             
         finally:
-            runtime = time.time() - self.start_time
+            runtime = (time.perf_counter_ns() - self.start_time_ns) / 1e9
             print(f"\n[TestRunner] Test completed after {runtime:.1f} seconds")
             self._print_test_summary()
     
     def _print_test_summary(self):
         """テスト結果サマリーを表示"""
-        status = test_mode_manager.get_status()
+        status = self.test_mode_manager.get_status()
         
         print("\n" + "="*60)
         print("📊 Test Summary")
@@ -180,18 +162,8 @@ def main():
     
     runner = TestRunner()
     
-    duration = getattr(args, 'duration', None)
-
-    if args.mode == 'unit':
-        runner.run_unit_test(duration)
-    elif args.mode == 'integration':
-        runner.run_integration_test(duration)
-    elif args.mode == 'demo':
-        runner.run_demo_mode(duration)
-    elif args.mode == 'debug':
-        runner.run_debug_mode()
-    elif args.mode == 'keyboard-test':
-        runner.run_keyboard_interrupt_test()
+    mode_name, title, extra_config, notice = _MODE_SPECS[args.mode]
+    runner.run(mode_name, title, getattr(args, 'duration', None), extra_config, notice)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,8 @@
 字幕フォーマット機能のテストスクリプト（改行なし版）
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'v2'))
-
-from services.obs_text_manager import OBSTextManager
-from core.event_queue import EventQueue
+from v2.services.obs_text_manager import OBSTextManager
+from v2.core.event_queue import EventQueue
 
 def test_subtitle_formatting():
     """字幕フォーマット機能をテストする"""
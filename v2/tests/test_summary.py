@@ -7,19 +7,18 @@ StreamEndedイベントを手動で発行してサマリー生成をテストす
 
 import sys
 import os
+import queue
 import time
+from pathlib import Path
 
-# プロジェクトルートをパスに追加
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import pytest
 
 from v2.core.event_queue import EventQueue
-from v2.core.events import StreamEnded
+from v2.core.events import StreamEnded, DailySummaryReady, PrepareDailySummary
 from v2.handlers.daily_summary_handler import DailySummaryHandler
-from memory_manager import MemoryManager
-from openai_adapter import OpenAIAdapter
 
 
-def test_summary_generation():
+def test_summary_generation(memory_manager):
     """サマリー生成機能をテスト"""
     print("=== 日次要約機能テスト ===")
     
@@ -28,13 +27,7 @@ def test_summary_generation():
     
     event_queue = EventQueue()
     
-    # OpenAIAdapter初期化（サマリー生成に必要）
-    openai_adapter = OpenAIAdapter("テスト用システムプロンプト", silent_mode=False)
-    
-    # MemoryManager初期化
-    memory_manager = MemoryManager(openai_adapter)
-    
-    # DailySummaryHandler初期化
+    # DailySummaryHandler初期化（MemoryManagerは conftest.py のセッション共有フィクスチャ）
     daily_summary_handler = DailySummaryHandler(event_queue, memory_manager)
     
     print("✅ 初期化完了")
@@ -49,9 +42,8 @@ def test_summary_generation():
         "今日は小説の創作について考えていました"
     ]
     
-    for conversation in test_conversations:
-        memory_manager.add_utterance(conversation, "蒼月ハヤテ")
-        print(f"  - 追加: {conversation}")
+    memory_manager.add_utterances(test_conversations, "蒼月ハヤテ")
+    print("\n".join(f"  - 追加: {conversation}" for conversation in test_conversations))
     
     # 3. StreamEndedイベントを手動発行
     print("🎯 StreamEndedイベントを発行...")
@@ -69,34 +61,32 @@ def test_summary_generation():
     
     # サマリー生成は別スレッドで実行されるため、少し待機
     max_wait_time = 30  # 最大30秒待機
-    start_time = time.time()
+    deadline = time.monotonic() + max_wait_time
     
-    while time.time() - start_time < max_wait_time:
+    while time.monotonic() < deadline:
+        # 残り時間だけキューで待つ（イベントが届いた時点で即座に起きる）
+        remaining = deadline - time.monotonic()
         try:
-            # イベントキューをチェック
-            event = event_queue.get_nowait()
-            print(f"📨 イベント受信: {type(event).__name__}")
-            
-            # PrepareDailySummaryコマンドが来たら処理する
-            if hasattr(event, 'task_id') and 'daily_summary' in str(event.task_id):
-                print(f"🔄 サマリー生成コマンドを処理中: {event.task_id}")
-                daily_summary_handler.handle_prepare_daily_summary(event)
-                continue
-            
-            # DailySummaryReadyイベントが来たら成功
-            if hasattr(event, 'success') and type(event).__name__ == 'DailySummaryReady':
-                if event.success:
-                    print(f"✅ サマリー生成成功!")
-                    print(f"📄 ファイル: {event.file_path}")
-                    print(f"📝 内容: {event.summary_text[:200]}...")
-                else:
-                    print(f"❌ サマリー生成失敗: {event.summary_text}")
-                break
-                
-        except:
-            # キューが空の場合は少し待機
-            time.sleep(0.1)
+            event = event_queue.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            continue
+        print(f"📨 イベント受信: {type(event).__name__}")
+        
+        # PrepareDailySummaryコマンドが来たら処理する
+        if isinstance(event, PrepareDailySummary):
+            print(f"🔄 サマリー生成コマンドを処理中: {event.task_id}")
+            daily_summary_handler.handle_prepare_daily_summary(event)
             continue
+        
+        # DailySummaryReadyイベントが来たら結果確認
+        if isinstance(event, DailySummaryReady):
+            if event.success:
+                print(f"✅ サマリー生成成功!")
+                print(f"📄 ファイル: {event.file_path}")
+                print(f"📝 内容: {event.summary_text[:200]}...")
+            else:
+                print(f"❌ サマリー生成失敗: {event.summary_text}")
+            break
     else:
         print("⚠️ サマリー生成がタイムアウトしました")
     
@@ -104,36 +94,33 @@ def test_summary_generation():
     summary_dir = daily_summary_handler.summary_dir
     print(f"📁 サマリーディレクトリ: {summary_dir}")
     
-    if os.path.exists(summary_dir):
-        files = os.listdir(summary_dir)
-        if files:
-            print("📋 生成されたファイル:")
-            for file in sorted(files):
-                file_path = os.path.join(summary_dir, file)
-                file_size = os.path.getsize(file_path)
-                print(f"  - {file} ({file_size} bytes)")
-                
+    # 一度のディレクトリ走査で名前とサイズ（DirEntryにキャッシュされたstat）を取得する
+    try:
+        with os.scandir(summary_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except FileNotFoundError:
+        print(f"📭 サマリーディレクトリが存在しません: {summary_dir}")
+    else:
+        if entries:
+            # ファイル一覧はまとめて出力する
+            print("\n".join(["📋 生成されたファイル:"] + [
+                f"  - {entry.name} ({entry.stat().st_size} bytes)" for entry in entries
+            ]))
+            
+            for entry in entries:
                 # 最新のファイル内容を表示
-                if file.endswith('.md'):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        print(f"📄 内容（最初の300文字）:")
-                        print(content[:300])
-                        if len(content) > 300:
-                            print("...")
+                if entry.name.endswith('.md'):
+                    content = Path(entry.path).read_text(encoding='utf-8')
+                    print(f"📄 内容（最初の300文字）:")
+                    print(content[:300])
+                    if len(content) > 300:
+                        print("...")
         else:
             print("📭 サマリーファイルが見つかりませんでした")
-    else:
-        print(f"📭 サマリーディレクトリが存在しません: {summary_dir}")
     
     print("\n🎯 日次要約機能テスト完了")
 
 
 if __name__ == "__main__":
-    try:
-        test_summary_generation()
-    except Exception as e:
-        print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+    # フィクスチャを使うため pytest 経由で実行する（-s で途中経過をそのまま表示する）
+    sys.exit(pytest.main([__file__, "-s"]))
\ No newline at end of file
@@ -10,39 +10,36 @@ import os
 import time
 import queue
 from datetime import datetime
+from pathlib import Path
 
-# プロジェクトルートをパスに追加
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import pytest
 
 from v2.core.event_queue import EventQueue
 from v2.core.events import DailySummaryReady, PrepareDailySummary
 from v2.handlers.daily_summary_handler import DailySummaryHandler
 from memory_manager import MemoryManager
-from openai_adapter import OpenAIAdapter
 from config import config
 
 
-def test_summary_with_data():
+def test_summary_with_data(openai_adapter):
     """実際のデータでサマリー機能をテスト"""
     print("=== サマリー機能テスト（実データ版） ===")
 
     # 0. テスト用の既存サマリーファイルを削除
-    summary_dir_path = config.paths.summary
     today_str = datetime.now().strftime("%Y%m%d")
-    test_summary_file = os.path.join(summary_dir_path, f"summary_{today_str}.txt")
-    if os.path.exists(test_summary_file):
-        os.remove(test_summary_file)
+    test_summary_file = Path(config.paths.summary) / f"summary_{today_str}.txt"
+    try:
+        test_summary_file.unlink()
         print(f"🧹 既存のテストサマリーファイルを削除しました: {test_summary_file}")
+    except FileNotFoundError:
+        pass
 
     # 1. 必要なコンポーネントを初期化
     print("🔧 コンポーネント初期化中...")
 
     event_queue = EventQueue()
 
-    # OpenAIAdapter初期化（サマリー生成に必要）
-    openai_adapter = OpenAIAdapter("テスト用システムプロンプト", silent_mode=False)
-
-    # MemoryManager初期化
+    # MemoryManager初期化（OpenAIAdapterは conftest.py の共有フィクスチャ、イベントキューはこのテスト専用）
     memory_manager = MemoryManager(openai_adapter, event_queue=event_queue)
 
     # DailySummaryHandler初期化
@@ -61,9 +58,10 @@ def test_summary_with_data():
         "小説創作のプロセスについて話し、言語による世界構築の可能性について考察しました。"
     ]
 
-    # MemoryManagerの長期記憶サマリーに直接設定
+    # MemoryManagerの長期記憶サマリーに直接設定（全件同じタイムスタンプで記録）
+    timestamp = datetime.now().isoformat()
     memory_manager.long_term_summary = "\n\n".join(
-        f"[{datetime.now().isoformat()}]\n{memory}" for memory in test_memories
+        f"[{timestamp}]\n{memory}" for memory in test_memories
     )
     print(f"  - 長期記憶に{len(test_memories)}件のデータを直接設定")
 
@@ -77,10 +75,10 @@ def test_summary_with_data():
     print("⏳ サマリー生成完了を待機中...")
 
     max_wait_time = 60  # 最大60秒待機
-    start_time = time.time()
+    deadline = time.monotonic() + max_wait_time
     found_success = False
 
-    while time.time() - start_time < max_wait_time:
+    while time.monotonic() < deadline:
         try:
             # イベントキューをチェック
             event = event_queue.get(timeout=1.0)
@@ -115,39 +113,36 @@ def test_summary_with_data():
     summary_dir = daily_summary_handler.summary_dir
     print(f"📁 サマリーディレクトリ: {summary_dir}")
 
-    if os.path.exists(summary_dir):
-        files = os.listdir(summary_dir)
-        if files:
-            print("📋 生成されたファイル:")
-            for file in sorted(files):
-                file_path = os.path.join(summary_dir, file)
-                file_size = os.path.getsize(file_path)
-                print(f"  - {file} ({file_size} bytes)")
+    # 一度のディレクトリ走査で名前とサイズ（DirEntryにキャッシュされたstat）を取得する
+    try:
+        with os.scandir(summary_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except FileNotFoundError:
+        print(f"📭 サマリーディレクトリが存在しません: {summary_dir}")
+    else:
+        if entries:
+            # ファイル一覧はまとめて出力する
+            print("\n".join(["📋 生成されたファイル:"] + [
+                f"  - {entry.name} ({entry.stat().st_size} bytes)" for entry in entries
+            ]))
 
+            for entry in entries:
                 # 最新のファイル内容を表示
-                if file.endswith(('.md', '.txt')):
+                if entry.name.endswith(('.md', '.txt')):
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            print("📄 内容:")
-                            print("="*50)
-                            print(content)
-                            print("="*50)
+                        content = Path(entry.path).read_text(encoding='utf-8')
+                        print("📄 内容:")
+                        print("="*50)
+                        print(content)
+                        print("="*50)
                     except Exception as e:
                         print(f"⚠️ ファイル読み込みエラー: {e}")
         else:
             print("📭 サマリーファイルが見つかりませんでした")
-    else:
-        print(f"📭 サマリーディレクトリが存在しません: {summary_dir}")
 
     print("\n🎯 サマリー機能テスト完了")
 
 
 if __name__ == "__main__":
-    try:
-        test_summary_with_data()
-    except Exception as e:
-        print(f"❌ テストエラー: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+    # フィクスチャを使うため pytest 経由で実行する（-s で途中経過をそのまま表示する）
+    sys.exit(pytest.main([__file__, "-s"]))
\ No newline at end of file
@@ -4,10 +4,13 @@ v2システムの統合テスト用スクリプト
 AivisSpeechエンジンが動作していない環境でもテストできるよう軽量化
 """
 
+import queue
 import time
 import threading
 from v2.core.event_queue import EventQueue
-from v2.core.events import AppStarted, NewCommentReceived
+from v2.core.events import (
+    AppStarted, NewCommentReceived, PlaySpeech, PrepareMonologue, PrepareCommentResponse
+)
 from v2.state.state_manager import StateManager
 from v2.controllers.main_controller import MainController
 from v2.services.audio_manager import AudioManager
@@ -33,12 +36,10 @@ def test_v2_system():
     # 3. メインコントローラーの初期化
     main_controller = MainController(event_queue, state_manager)
     
-    # 4. コマンドハンドラーのマッピング
-    command_handlers = {
-        'PlaySpeech': audio_manager.handle_play_speech,
-        'PrepareMonologue': monologue_handler.handle_prepare_monologue,
-        'PrepareCommentResponse': comment_handler.handle_prepare_comment_response,
-    }
+    # 4. コマンドハンドラーをメインコントローラーに登録
+    main_controller.register_command_handler(PlaySpeech, audio_manager.handle_play_speech)
+    main_controller.register_command_handler(PrepareMonologue, monologue_handler.handle_prepare_monologue)
+    main_controller.register_command_handler(PrepareCommentResponse, comment_handler.handle_prepare_comment_response)
     
     print("✅ All components initialized successfully")
     
@@ -74,26 +75,22 @@ def test_v2_system():
     
     cycle_count = 0
     max_cycles = 5
+    deadline = time.monotonic() + 5.0  # キューが空のまま待つのは最大5秒
     
     while cycle_count < max_cycles and state_manager.is_running:
         try:
             try:
-                item = event_queue.get_nowait()  # ノンブロッキングで取得
-            except:
-                # キューが空の場合は少し待機してから再試行
-                time.sleep(0.5)
-                continue
+                # キューの条件変数で待ち、アイテムが届いた時点で即座に処理する
+                item = event_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                print("  ⏰ No more items within the deadline")
+                break
             
             print(f"  📨 Processing: {type(item).__name__}")
             print(f"  📊 System state: {state_manager.current_state.value}")
             
-            # コマンドかイベントかを判定して適切に処理
-            item_type_name = type(item).__name__
-            if item_type_name in command_handlers:
-                command_handlers[item_type_name](item)
-            else:
-                # イベントの場合
-                main_controller.process_item(item)
+            # コマンドは登録済みの処理関数へ、イベントはメインコントローラーで処理
+            main_controller.dispatch(item)
             
             cycle_count += 1
             print(f"  ✅ Cycle {cycle_count}/{max_cycles} completed")
@@ -5,7 +5,7 @@ v2システムのメトリクス機能テスト用スクリプト
 
 import time
 import json
-from v2.core.metrics import get_metrics_collector, record_performance, record_event, record_value, measure_performance
+from v2.core.metrics import get_metrics_collector, record_performance, record_performance_bulk, record_event, record_value, measure_performance
 
 
 @measure_performance("TestComponent", "test_operation")
@@ -48,27 +48,30 @@ def test_metrics_system():
     for i in range(3):
         test_operation_with_decorator(0.05 + i * 0.02)
     
+    # 3〜5の結果はまとめて組み立て、一度に出力する
+    report = []
+    
     # 3. メトリクスサマリーの表示
-    print("\n📈 Metrics Summary:")
+    report.append("\n📈 Metrics Summary:")
     summary = collector.get_metrics_summary()
-    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    report.append(json.dumps(summary, indent=2, ensure_ascii=False))
     
     # 4. 特定コンポーネントのメトリクス
-    print("\n🎯 Component-specific metrics (AudioManager):")
+    report.append("\n🎯 Component-specific metrics (AudioManager):")
     audio_metrics = collector.get_component_metrics("AudioManager")
-    print(json.dumps(audio_metrics, indent=2, ensure_ascii=False))
+    report.append(json.dumps(audio_metrics, indent=2, ensure_ascii=False))
     
     # 5. システム健全性
-    print("\n🏥 System Health:")
+    report.append("\n🏥 System Health:")
     health = collector.get_system_health()
-    print(json.dumps(health, indent=2, ensure_ascii=False))
+    report.append(json.dumps(health, indent=2, ensure_ascii=False))
+    
+    print("\n".join(report))
     
     # 6. 追加データで統計精度を向上
     print("\n📊 Adding more performance data for better statistics...")
-    for i in range(10):
-        duration = 1.0 + (i * 0.2)  # 1.0〜3.0秒の範囲
-        success = i < 8  # 80%成功率
-        record_performance("TestComponent", "bulk_operation", duration, success)
+    # 1.0〜2.8秒の範囲、80%成功率
+    record_performance_bulk("TestComponent", "bulk_operation", [(1.0 + i * 0.2, i < 8) for i in range(10)])
     
     # 最終統計の表示
     print("\n📊 Final Statistics:")
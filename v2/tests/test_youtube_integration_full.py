@@ -4,12 +4,16 @@ YouTube IDからコメント取得成功までの完全統合テスト
 main_v2.pyの修正が正しく動作し、実際のYouTubeコメントを取得できることを確認
 """
 
+import contextlib
+import logging
 import os
+import queue
 import sys
 import time
 import threading
 from unittest.mock import patch
-from datetime import datetime
+from types import SimpleNamespace
+from typing import Iterable, Optional
 
 # パスを追加
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
@@ -18,9 +22,21 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../src'))
 from dotenv import load_dotenv
 load_dotenv()
 
+# 対象のビデオIDはモジュール読み込み時に一度だけ取得する
+_VIDEO_ID = os.getenv('YOUTUBE_VIDEO_ID')
+
+_BANNER_SEPARATOR = "=" * 60
+
+# 処理ループで1回にまとめて取り出すアイテムの上限（状態確認とタイムアウト判定を間に挟むため）
+_DRAIN_BATCH_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
 # v2システムのインポート
 from v2.core.event_queue import EventQueue
-from v2.core.events import AppStarted, NewCommentReceived
+from v2.core.events import (
+    AppStarted, NewCommentReceived, PlaySpeech, PrepareMonologue, PrepareCommentResponse
+)
 from v2.state.state_manager import StateManager
 from v2.controllers.main_controller import MainController
 from v2.services.audio_manager import AudioManager
@@ -37,11 +53,80 @@ except ImportError:
     print("⚠️  pytchatが利用できません。モックテストのみ実行します。")
 
 
+# テスト投入用コメントの雛形（可変部分だけを差し替えて使う）
+_COMMENT_AUTHOR_FLAGS = {
+    "is_owner": False,
+    "is_moderator": False,
+    "is_verified": False,
+    "badge_url": None
+}
+_COMMENT_TEMPLATE = {
+    "username": "",
+    "message": "",
+    "timestamp": "",
+    "user_id": "",
+    "message_id": "",
+    "author": None,
+    "superchat": None
+}
+
+
+def _make_test_comment(username: str, message: str, user_id: str,
+                       message_id: str, channel_id: str) -> dict:
+    """雛形をコピーしてテスト用コメントを作成する"""
+    comment = _COMMENT_TEMPLATE.copy()
+    comment["username"] = username
+    comment["message"] = message
+    comment["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    comment["user_id"] = user_id
+    comment["message_id"] = message_id
+    comment["author"] = {"name": username, "channel_id": channel_id, **_COMMENT_AUTHOR_FLAGS}
+    return comment
+
+
+class _FakeChat:
+    """
+    pytchat.create の代わりに使うオフライン用のチャット。
+    最初の get() で1件だけコメントを返し、以降は空を返す。
+    """
+    
+    def __init__(self, video_id: str):
+        self.video_id = video_id
+        self._pending = [SimpleNamespace(
+            id="fake_comment_001",
+            message="オフラインテスト用コメント",
+            datetime="2025-07-24 12:00:00",
+            author=SimpleNamespace(
+                name="オフラインテストユーザー",
+                channelId="fake_channel_001",
+                isOwner=False,
+                isModerator=False,
+                isVerified=False,
+                badgeUrl=None,
+            ),
+        )]
+        self._alive = True
+    
+    def is_alive(self) -> bool:
+        return self._alive
+    
+    def get(self):
+        items, self._pending = self._pending, []
+        return SimpleNamespace(sync_items=lambda: items)
+    
+    def terminate(self):
+        self._alive = False
+
+
 class YouTubeIntegrationTester:
     """YouTube統合テストクラス"""
     
-    def __init__(self):
-        self.video_id = os.getenv('YOUTUBE_VIDEO_ID')
+    def __init__(self, remote: Optional[bool] = None):
+        self.video_id = _VIDEO_ID
+        # 実際のYouTubeに接続するのは明示的に指定した場合のみ（既定はオフライン）
+        if remote is None:
+            remote = os.getenv('YOUTUBE_REMOTE_TEST', 'false').lower() == 'true'
+        self.remote = remote
         self.test_results = {
             'env_setup': False,
             'component_init': False,
@@ -110,11 +195,13 @@ class YouTubeIntegrationTester:
             print("✅ メインコントローラー初期化完了")
             
             # 4. コマンドハンドラーマッピング
-            self.command_handlers = {
-                'PlaySpeech': self.audio_manager.handle_play_speech,
-                'PrepareMonologue': self.monologue_handler.handle_prepare_monologue,
-                'PrepareCommentResponse': self.comment_handler.handle_prepare_comment_response,
+            command_handlers = {
+                PlaySpeech: self.audio_manager.handle_play_speech,
+                PrepareMonologue: self.monologue_handler.handle_prepare_monologue,
+                PrepareCommentResponse: self.comment_handler.handle_prepare_comment_response,
             }
+            for command_type, handler in command_handlers.items():
+                self.main_controller.register_command_handler(command_type, handler)
             print("✅ コマンドハンドラーマッピング完了")
             
             self.test_results['component_init'] = True
@@ -166,48 +253,37 @@ class YouTubeIntegrationTester:
         """コメント取得テスト（テストモード使用）"""
         print("=== 4. コメント取得テスト ===")
         
+        if not self._ensure_components():
+            return False
+        
+        # 初期化済みのコメントマネージャーをテストモードに切り替えて使い、最後に元のモードへ戻す
+        test_comment_manager = self.comment_manager
+        previous_test_mode = test_comment_manager.test_mode
         try:
             # テストモードでコメント取得をテスト
             print("🧪 テストモードでコメント取得テスト")
             
-            # 環境変数を一時的にテストモードに設定
-            original_test_mode = os.getenv('CHAT_TEST_MODE')
-            os.environ['CHAT_TEST_MODE'] = 'true'
-            
-            # 新しいコメントマネージャーを作成
-            test_comment_manager = IntegratedCommentManager(self.event_queue)
-            
-            # テストモードが有効になっているか確認
-            if not test_comment_manager.test_mode:
-                print("❌ テストモードが有効になっていません")
-                return False
+            test_comment_manager.set_test_mode(True)
             print("✅ テストモード有効")
             
             # コメント監視を開始
             test_comment_manager.start()
             print("✅ コメント監視開始")
             
-            # 少し待機してダミーコメント生成を確認
+            # 最初のダミーコメントが届くまで待機（届いた時点で先へ進む、最大2秒）
             print("⏱️  ダミーコメント生成待機中...")
-            time.sleep(2)
+            try:
+                self.event_queue.get(timeout=2.0)
+                print("✅ ダミーコメント受信")
+            except queue.Empty:
+                print("⚠️  2秒以内にダミーコメントは生成されませんでした")
             
             # 手動でコメント追加テスト
-            test_comment = {
-                "username": "統合テストユーザー",
-                "message": "統合テスト用メッセージ",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "user_id": "integration_test_user",
-                "message_id": "integration_test_msg",
-                "author": {
-                    "name": "統合テストユーザー",
-                    "channel_id": "integration_test_channel",
-                    "is_owner": False,
-                    "is_moderator": False,
-                    "is_verified": False,
-                    "badge_url": None
-                },
-                "superchat": None
-            }
+            test_comment = _make_test_comment(
+                "統合テストユーザー", "統合テスト用メッセージ",
+                "integration_test_user", "integration_test_msg",
+                "integration_test_channel"
+            )
             
             test_comment_manager.add_comment(test_comment)
             print("✅ テストコメント追加完了")
@@ -220,15 +296,6 @@ class YouTubeIntegrationTester:
             
             print(f"✅ コメント取得成功: {recent_comments[0]['message']}")
             
-            # 停止
-            test_comment_manager.stop()
-            
-            # 環境変数を元に戻す
-            if original_test_mode is not None:
-                os.environ['CHAT_TEST_MODE'] = original_test_mode
-            else:
-                os.environ.pop('CHAT_TEST_MODE', None)
-            
             self.test_results['comment_retrieval'] = True
             print("✅ コメント取得テスト完了\n")
             return True
@@ -236,29 +303,24 @@ class YouTubeIntegrationTester:
         except Exception as e:
             print(f"❌ コメント取得テストエラー: {e}")
             return False
+        finally:
+            # 失敗や例外の場合も監視を止めて、テストモードを元に戻す
+            test_comment_manager.stop()
+            test_comment_manager.set_test_mode(previous_test_mode)
     
     def test_event_processing(self):
         """イベント処理テスト"""
         print("=== 5. イベント処理テスト ===")
         
+        if not self._ensure_components():
+            return False
+        
         try:
             # イベントキューにテストイベントを追加
-            test_comments = [{
-                "username": "イベントテストユーザー",
-                "message": "イベント処理テストメッセージ",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "user_id": "event_test_user",
-                "message_id": "event_test_msg",
-                "author": {
-                    "name": "イベントテストユーザー",
-                    "channel_id": "event_test_channel",
-                    "is_owner": False,
-                    "is_moderator": False,
-                    "is_verified": False,
-                    "badge_url": None
-                },
-                "superchat": None
-            }]
+            test_comments = [_make_test_comment(
+                "イベントテストユーザー", "イベント処理テストメッセージ",
+                "event_test_user", "event_test_msg", "event_test_channel"
+            )]
             
             # NewCommentReceivedイベントを作成
             comment_event = NewCommentReceived(comments=test_comments)
@@ -274,20 +336,15 @@ class YouTubeIntegrationTester:
             processed_events = 0
             max_events = 2
             
-            while processed_events < max_events:
-                try:
-                    item = self.event_queue.get_nowait()
-                    print(f"📨 処理中: {type(item).__name__}")
-                    
-                    # メインコントローラーでイベント処理
-                    self.main_controller.process_item(item)
-                    processed_events += 1
-                    print(f"✅ イベント処理完了 ({processed_events}/{max_events})")
-                    
-                except Exception as queue_error:
-                    if "Empty" in str(queue_error):
-                        break
-                    raise queue_error
+            # 取り出すのはこのループだけなので、qsize分は get_nowait が必ず成功する
+            for _ in range(min(max_events, self.event_queue.qsize())):
+                item = self.event_queue.get_nowait()
+                print(f"📨 処理中: {type(item).__name__}")
+                
+                # メインコントローラーでイベント処理
+                self.main_controller.process_item(item)
+                processed_events += 1
+                print(f"✅ イベント処理完了 ({processed_events}/{max_events})")
             
             if processed_events > 0:
                 print(f"✅ {processed_events}個のイベントを正常に処理")
@@ -306,6 +363,9 @@ class YouTubeIntegrationTester:
         """フル統合テスト（main_v2.pyの動作模擬）"""
         print("=== 6. フル統合テスト ===")
         
+        if not self._ensure_components():
+            return False
+        
         try:
             print("🚀 main_v2.pyの動作を模擬したフル統合テスト")
             
@@ -319,32 +379,38 @@ class YouTubeIntegrationTester:
             
             # メインループを短時間実行
             print("🔄 メインループ開始（5秒間）")
-            start_time = time.time()
             loop_duration = 5
+            end_time = time.monotonic() + loop_duration
             processed_items = 0
-            
-            while time.time() - start_time < loop_duration and self.state_manager.is_running:
+            dispatch = self.main_controller.dispatch
+            # ループ中は出力せず、処理ログを溜めて終了後にまとめて表示する
+            processed_log = []
+            log_processed = logger.isEnabledFor(logging.INFO)
+            
+            while self.state_manager.is_running:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    break
                 try:
-                    # ノンブロッキングでアイテム取得
-                    item = self.event_queue.get_nowait()
-                    
-                    print(f"📨 処理中: {type(item).__name__}")
-                    
-                    # コマンドかイベントかを判定
-                    item_type_name = type(item).__name__
-                    if item_type_name in self.command_handlers:
-                        self.command_handlers[item_type_name](item)
-                    else:
-                        self.main_controller.process_item(item)
+                    # アイテムが届くまでキューで待つ（状態確認のため最大0.5秒ごとに起きる）
+                    item = self.event_queue.get(timeout=min(0.5, remaining))
+                except queue.Empty:
+                    continue
+                
+                # 続けて溜まっているアイテムも上限までまとめて取り出して処理する
+                for queued in [item, *self.event_queue.drain_nowait(limit=_DRAIN_BATCH_SIZE - 1)]:
+                    # コマンドは登録済みハンドラーへ、イベントはprocess_itemへ振り分け
+                    dispatch(queued)
                     
                     processed_items += 1
-                    print(f"✅ アイテム処理完了 (#{processed_items})")
-                    
-                except Exception as queue_error:
-                    if "Empty" in str(queue_error):
-                        time.sleep(0.1)  # キューが空の場合は少し待機
-                        continue
-                    raise queue_error
+                    if log_processed:
+                        processed_log.append((processed_items, type(queued).__name__))
+            
+            if processed_log:
+                logger.info("\n".join(
+                    f"✅ アイテム処理完了 (#{number}): {item_type_name}"
+                    for number, item_type_name in processed_log
+                ))
             
             # システム状態確認
             print(f"📊 システム状態: {self.state_manager.get_status_summary()}")
@@ -363,38 +429,75 @@ class YouTubeIntegrationTester:
             print(f"❌ フル統合テストエラー: {e}")
             return False
     
-    def run_all_tests(self):
-        """すべてのテストを実行"""
+    def _ensure_components(self) -> bool:
+        """コンポーネントが未初期化なら初期化する（テストを単独で実行できるようにする）"""
+        if getattr(self, 'main_controller', None) is not None:
+            return True
+        return self.test_component_initialization()
+    
+    def _run_test(self, test_name, test_func) -> bool:
+        """1つのテストを実行し、成功したかどうかを返す"""
+        try:
+            return bool(test_func())
+        except Exception as e:
+            print(f"❌ {test_name}テストで予期しないエラー: {e}")
+            return False
+    
+    def run_all_tests(self, only: Optional[Iterable[str]] = None):
+        """
+        すべてのテストを実行
+        
+        Args:
+            only: 実行するテストの結果キー（省略時はすべて実行）
+        """
         print("🎬 YouTube IDからコメント取得成功までの統合テスト開始")
-        print("=" * 60)
+        print(_BANNER_SEPARATOR)
         
+        # 順番に実行する。各テストはイベントキューやコンポーネントを共有するため並列にはしない
+        # （実接続時の pytchat.create はシグナルハンドラを登録するのでメインスレッドで呼ぶ必要もある）
+        # 各テストは (表示名, 結果キー, テスト関数)
         tests = [
-            ("環境設定", self.test_environment_setup),
-            ("コンポーネント初期化", self.test_component_initialization),
-            ("YouTube接続", self.test_youtube_connection),
-            ("コメント取得", self.test_comment_retrieval),
-            ("イベント処理", self.test_event_processing),
-            ("フル統合", self.test_full_integration),
+            ("環境設定", 'env_setup', self.test_environment_setup),
+            ("コンポーネント初期化", 'component_init', self.test_component_initialization),
+            ("YouTube接続", 'youtube_connection', self.test_youtube_connection),
+            ("コメント取得", 'comment_retrieval', self.test_comment_retrieval),
+            ("イベント処理", 'event_processing', self.test_event_processing),
+            ("フル統合", 'full_integration', self.test_full_integration),
         ]
         
+        # 結果キーが指定された場合はそのテストだけを実行する
+        if only:
+            selected = set(only)
+            unknown = selected - set(self.test_results)
+            if unknown:
+                print(f"❌ 不明なテスト名: {', '.join(sorted(unknown))}")
+                print(f"   指定可能: {', '.join(self.test_results)}")
+                return False
+            tests = [test for test in tests if test[1] in selected]
+            self.test_results = {
+                key: result for key, result in self.test_results.items() if key in selected
+            }
+        
         failed_tests = []
         
-        for test_name, test_func in tests:
-            try:
-                if not test_func():
+        # オフライン時はpytchatへの接続をすべて偽のチャットに差し替える
+        if self.remote or not PYTCHAT_AVAILABLE:
+            network = contextlib.nullcontext()
+        else:
+            print("🔌 オフラインモード: pytchat.create を差し替えて実行します（YOUTUBE_REMOTE_TEST=true で実接続）")
+            network = patch.object(pytchat, "create", _FakeChat)
+        
+        with network:
+            for test_name, _, test_func in tests:
+                if not self._run_test(test_name, test_func):
                     failed_tests.append(test_name)
-            except Exception as e:
-                print(f"❌ {test_name}テストで予期しないエラー: {e}")
-                failed_tests.append(test_name)
         
         # 結果サマリー
-        print("=" * 60)
-        print("📊 テスト結果サマリー")
-        print("=" * 60)
-        
+        summary_lines = [_BANNER_SEPARATOR, "📊 テスト結果サマリー", _BANNER_SEPARATOR]
         for test_name, result in self.test_results.items():
             status = "✅ 成功" if result else "❌ 失敗"
-            print(f"{test_name:20s}: {status}")
+            summary_lines.append(f"{test_name:20s}: {status}")
+        print("\n".join(summary_lines))
         
         total_tests = len(self.test_results)
         passed_tests = sum(self.test_results.values())
@@ -420,8 +523,11 @@ class YouTubeIntegrationTester:
 
 def main():
     """メイン実行関数"""
+    # スクリプトとして実行した場合は処理ログ（INFO）を出す。TESTLOG で変更可能
+    logging.basicConfig(level=os.environ.get("TESTLOG", "INFO"), format="%(message)s")
     tester = YouTubeIntegrationTester()
-    success = tester.run_all_tests()
+    # 引数で結果キーを指定すると、そのテストだけを実行する（例: event_processing full_integration）
+    success = tester.run_all_tests(sys.argv[1:] or None)
     
     if success:
         print("\n🚀 統合テスト完了: システムは正常に動作します")
@@ -4,10 +4,10 @@ YouTubeライブコメント取得のテスト用スクリプト
 実際のライブ配信に接続してコメントを取得・表示します
 """
 
+import logging
 import os
 import time
 import sys
-from datetime import datetime
 from typing import Optional
 
 try:
@@ -21,41 +21,58 @@ except ImportError:
 from dotenv import load_dotenv
 load_dotenv()
 
+# 対象のビデオIDはモジュール読み込み時に一度だけ取得する
+_VIDEO_ID = os.getenv('YOUTUBE_VIDEO_ID')
 
-def test_youtube_connection(video_id: str, test_duration: int = 60):
+_BANNER_SEPARATOR = "=" * 50
+_COMMENT_SEPARATOR = "-" * 30
+
+logger = logging.getLogger(__name__)
+
+
+def test_youtube_connection(video_id: str, test_duration: int = 60, chat=None):
     """
     YouTubeライブコメント取得のテスト
     
     Args:
         video_id: YouTubeビデオID
         test_duration: テスト実行時間（秒）
+        chat: 接続済みのpytchatオブジェクト（省略時は新たに接続する）
     """
     print("=== YouTube Live Comments Test ===")
     print(f"📺 Video ID: {video_id}")
     print(f"⏱️  Test Duration: {test_duration} seconds")
-    print("=" * 50)
+    print(_BANNER_SEPARATOR)
     
     try:
         # YouTubeチャットに接続
-        print("🔌 Connecting to YouTube Live Chat...")
-        chat = pytchat.create(video_id=video_id)
+        if chat is None:
+            print("🔌 Connecting to YouTube Live Chat...")
+            chat = pytchat.create(video_id=video_id)
         print("✅ Connected successfully!")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         comment_count = 0
+        # コメント表示はINFOログ。無効な場合は整形自体を行わない
+        log_comments = logger.isEnabledFor(logging.INFO)
         
-        while chat.is_alive() and (time.time() - start_time) < test_duration:
+        while chat.is_alive() and (time.monotonic() - start_time) < test_duration:
             try:
+                # 表示用の時刻は取得したまとまりごとに一度だけ整形する
+                timestamp = time.strftime("%H:%M:%S")
                 for comment in chat.get().sync_items():
                     comment_count += 1
+                    if not log_comments:
+                        continue
                     
-                    # コメント情報の表示
-                    timestamp = datetime.now().strftime("%H:%M:%S")
-                    print(f"\n[{timestamp}] Comment #{comment_count}")
-                    print(f"👤 User: {comment.author.name}")
-                    print(f"💬 Message: {comment.message}")
-                    print(f"🆔 Message ID: {comment.id}")
-                    print(f"📅 DateTime: {comment.datetime}")
+                    # コメント情報の表示（1件分をまとめて1回で出力する）
+                    lines = [
+                        f"\n[{timestamp}] Comment #{comment_count}",
+                        f"👤 User: {comment.author.name}",
+                        f"💬 Message: {comment.message}",
+                        f"🆔 Message ID: {comment.id}",
+                        f"📅 DateTime: {comment.datetime}",
+                    ]
                     
                     # ユーザー情報
                     author = comment.author
@@ -68,16 +85,16 @@ def test_youtube_connection(video_id: str, test_duration: int = 60):
                         user_info.append("✅ Verified")
                     
                     if user_info:
-                        print(f"🏷️  Status: {', '.join(user_info)}")
+                        lines.append(f"🏷️  Status: {', '.join(user_info)}")
                     
                     # スーパーチャット情報
                     if hasattr(comment, 'amountValue') and comment.amountValue:
-                        print(f"💰 Super Chat: {comment.amountString}")
+                        lines.append(f"💰 Super Chat: {comment.amountString}")
                     
-                    print("-" * 30)
+                    lines.append(_COMMENT_SEPARATOR)
+                    logger.info("\n".join(lines))
                 
-                # 少し待機してCPU使用率を抑制
-                time.sleep(1)
+                # sync_items() がpytchatの取得間隔に合わせて待機するため、ここでの追加の待機は不要
                 
             except KeyboardInterrupt:
                 print("\n⏹️  Test interrupted by user")
@@ -91,7 +108,7 @@ def test_youtube_connection(video_id: str, test_duration: int = 60):
         chat.terminate()
         
         # 結果サマリー
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.monotonic() - start_time
         print(f"\n📊 Test Results:")
         print(f"   - Total Comments: {comment_count}")
         print(f"   - Test Duration: {elapsed_time:.1f} seconds")
@@ -109,18 +126,25 @@ def test_youtube_connection(video_id: str, test_duration: int = 60):
         return False
 
 
-def get_video_info(video_id: str) -> Optional[dict]:
-    """ビデオ情報を取得（可能な場合）"""
+def get_video_info(video_id: str, chat=None) -> Optional[dict]:
+    """
+    ビデオ情報を取得（可能な場合）
+    
+    接続済みのchatを渡した場合はそれを使い、切断せずにそのまま残す。
+    """
     try:
         # pytchatでビデオの基本情報を取得
-        chat = pytchat.create(video_id=video_id)
+        owns_chat = chat is None
+        if owns_chat:
+            chat = pytchat.create(video_id=video_id)
         if chat.is_alive():
             info = {
                 "video_id": video_id,
                 "status": "live",
                 "chat_available": True
             }
-            chat.terminate()
+            if owns_chat:
+                chat.terminate()
             return info
         else:
             return {
@@ -139,11 +163,13 @@ def get_video_info(video_id: str) -> Optional[dict]:
 
 def main():
     """メイン実行関数"""
+    # スクリプトとして実行した場合はコメント表示（INFO）を出す。TESTLOG で変更可能
+    logging.basicConfig(level=os.environ.get("TESTLOG", "INFO"), format="%(message)s")
     print("🎬 YouTube Live Comments Connection Test")
-    print("=" * 50)
+    print(_BANNER_SEPARATOR)
     
     # 環境変数からビデオIDを取得
-    video_id = os.getenv('YOUTUBE_VIDEO_ID')
+    video_id = _VIDEO_ID
     if not video_id:
         print("❌ YOUTUBE_VIDEO_ID environment variable not set")
         print("Please set it in your .env file")
@@ -153,7 +179,13 @@ def main():
     
     # ビデオ情報の確認
     print("\n🔍 Checking video status...")
-    video_info = get_video_info(video_id)
+    # 状態確認とコメント取得で同じ接続を使い回す（接続は一度だけ）
+    try:
+        chat = pytchat.create(video_id=video_id)
+    except Exception as e:
+        print(f"⚠️  Failed to connect: {e}")
+        chat = None
+    video_info = get_video_info(video_id, chat)
     print(f"Video Info: {video_info}")
     
     if not video_info.get('chat_available', False):
@@ -168,6 +200,8 @@ def main():
         response = input().lower().strip()
         if response != 'y':
             print("Test cancelled.")
+            if chat is not None:
+                chat.terminate()
             return
     
     # テスト実行時間の設定
@@ -184,7 +218,7 @@ def main():
     print("Press Ctrl+C to stop early\n")
     
     # テスト実行
-    success = test_youtube_connection(video_id, test_duration)
+    success = test_youtube_connection(video_id, test_duration, chat)
     
     if success:
         print("\n✅ Test completed successfully!")
@@ -3,10 +3,10 @@
 YouTubeライブコメント取得の簡単なテスト（非対話式）
 """
 
+import logging
 import os
 import time
 import sys
-from datetime import datetime
 
 try:
     import pytchat
@@ -17,10 +17,17 @@ except ImportError:
 from dotenv import load_dotenv
 load_dotenv()
 
+# 対象のビデオIDはモジュール読み込み時に一度だけ取得する
+_VIDEO_ID = os.getenv('YOUTUBE_VIDEO_ID')
+
+_BANNER_SEPARATOR = "=" * 50
+
+logger = logging.getLogger(__name__)
+
 
 def test_youtube_live_comments():
     """YouTubeライブコメント取得のシンプルテスト"""
-    video_id = os.getenv('YOUTUBE_VIDEO_ID')
+    video_id = _VIDEO_ID
     if not video_id:
         print("❌ YOUTUBE_VIDEO_ID environment variable not set")
         return False
@@ -28,7 +35,7 @@ def test_youtube_live_comments():
     print("=== YouTube Live Comments Simple Test ===")
     print(f"📺 Video ID: {video_id}")
     print(f"⏱️  Test Duration: 15 seconds")
-    print("=" * 50)
+    print(_BANNER_SEPARATOR)
     
     try:
         # YouTubeチャットに接続
@@ -41,38 +48,47 @@ def test_youtube_live_comments():
             
         print("✅ Connected successfully!")
         
-        start_time = time.time()
+        start_time = time.monotonic()
         comment_count = 0
         test_duration = 15  # 15秒間テスト
         
         print(f"📡 Monitoring for {test_duration} seconds...")
         
-        while chat.is_alive() and (time.time() - start_time) < test_duration:
+        # コメント表示はINFOログ。無効な場合は整形自体を行わない
+        log_comments = logger.isEnabledFor(logging.INFO)
+        
+        while chat.is_alive() and (time.monotonic() - start_time) < test_duration:
             try:
                 chat_data = chat.get()
                 items = chat_data.sync_items()
+                # 表示用の時刻は取得したまとまりごとに一度だけ整形する
+                timestamp = time.strftime("%H:%M:%S")
                 
                 for comment in items:
                     comment_count += 1
-                    timestamp = datetime.now().strftime("%H:%M:%S")
+                    if not log_comments:
+                        continue
                     
-                    print(f"\n[{timestamp}] Comment #{comment_count}")
-                    print(f"👤 {comment.author.name}: {comment.message}")
+                    lines = [
+                        f"\n[{timestamp}] Comment #{comment_count}",
+                        f"👤 {comment.author.name}: {comment.message}",
+                    ]
                     
                     # ユーザー情報
                     if comment.author.isOwner:
-                        print("   🎬 (Channel Owner)")
+                        lines.append("   🎬 (Channel Owner)")
                     if comment.author.isModerator:
-                        print("   🛡️ (Moderator)")
+                        lines.append("   🛡️ (Moderator)")
                     if comment.author.isVerified:
-                        print("   ✅ (Verified)")
+                        lines.append("   ✅ (Verified)")
                     
                     # スーパーチャット
                     if hasattr(comment, 'amountValue') and comment.amountValue:
-                        print(f"   💰 Super Chat: {comment.amountString}")
+                        lines.append(f"   💰 Super Chat: {comment.amountString}")
+                    
+                    logger.info("\n".join(lines))
                 
-                # CPU使用率を抑制
-                time.sleep(0.5)
+                # sync_items() がpytchatの取得間隔に合わせて待機するため、ここでの追加の待機は不要
                 
             except Exception as e:
                 print(f"⚠️  Error processing comments: {e}")
@@ -81,7 +97,7 @@ def test_youtube_live_comments():
         
         # 終了処理
         chat.terminate()
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         
         print(f"\n📊 Test Results:")
         print(f"   - Duration: {elapsed:.1f} seconds")
@@ -103,6 +119,9 @@ def test_youtube_live_comments():
 
 def main():
     """メイン実行"""
+    # スクリプトとして実行した場合はコメント表示（INFO）を出す。TESTLOG で変更可能
+    logging.basicConfig(level=os.environ.get("TESTLOG", "INFO"), format="%(message)s")
+    
     success = test_youtube_live_comments()
     
     if success:
@@ -3,20 +3,186 @@
 YouTubeライブコメントに対してNGワードや不適切コンテンツのフィルタリングを実行
 """
 
+import functools
 import re
 import json
-from typing import List, Dict, Any, Optional
+import threading
+from dataclasses import dataclass
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable, Collection
 from pathlib import Path
 
 
+# 一括フィルタリング時にメッセージ同士を連結する区切り文字（NGワードには現れない制御文字）
+_BATCH_SEPARATOR = "\x1e"
+
+# メッセージ内容の判定結果をキャッシュする件数
+_MESSAGE_CACHE_SIZE = 2048
+# NGワードを事前に走査していないことを表す印（Noneは「走査済みでヒットなし」）
+_NOT_PRESCANNED = object()
+
+# 許可したときの理由（毎回同じ文字列オブジェクトを使う）
+_REASON_PASS = 'フィルタリング通過'
+
+
+@dataclass(slots=True)
+class FilterResult:
+    """
+    filter_comment の結果
+    
+    従来の辞書と同じく result['allowed'] のような添字アクセスもできる
+    """
+    allowed: bool       # コメントが許可されるか
+    reason: str         # 拒否された場合の理由
+    original: Dict[str, Any]  # 元のコメントデータ
+    cleaned: str        # クリーニング後のメッセージ（allowedがTrueの場合）
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+# 基本的なNGワード
+_DEFAULT_NG_WORDS = (
+    "スパム", "宣伝", "広告", "アンチ", "荒らし",
+    "死ね", "消えろ", "うざい", "きもい", "ブス",
+    "詐欺", "騙", "違法", "犯罪", "殺"
+)
+
+# 英語のNGワード
+_ENGLISH_NG_WORDS = (
+    "spam", "advertisement", "scam", "fake", "bot",
+    "hate", "kill", "die", "stupid", "ugly"
+)
+
+# 正規表現パターン（URL、連続文字など）
+_DEFAULT_NG_PATTERNS = (
+    re.compile(r'https?://[^\s]+', re.IGNORECASE),  # URL
+    re.compile(r'(.)\1{4,}'),  # 同じ文字の5回以上連続
+    re.compile(r'[!@#$%^&*]{3,}'),  # 記号の連続
+    re.compile(r'^\d+$'),  # 数字のみ
+    re.compile(r'[A-Z]{10,}'),  # 大文字の連続
+)
+
+# 上のパターンを名前付きグループで1つにまとめる（該当の有無を1回の検索で判定する）
+_FUSED_NG_GROUPS = (
+    ('url', r'(?P<url>(?i:https?://[^\s]+))'),
+    ('repeat', r'(?P<repeat>(?P<repeat_char>.)(?P=repeat_char){4,})'),
+    ('symbols', r'(?P<symbols>[!@#$%^&*]{3,})'),
+    ('digits', r'(?P<digits>^\d+$)'),
+    ('caps', r'(?P<caps>[A-Z]{10,})'),
+)
+# 大文字の連続が成り立つ最小の文字数
+_CAPS_MIN_LENGTH = 10
+
+
+def _compile_fused_ng_pattern(with_url: bool, with_caps: bool) -> re.Pattern:
+    """マッチし得ないグループ（URL・大文字の連続）を除いた統合パターンを作る"""
+    return re.compile('|'.join(
+        source for name, source in _FUSED_NG_GROUPS
+        if (with_url or name != 'url') and (with_caps or name != 'caps')
+    ))
+
+
+# (「://」を含むか, 大文字の連続が入る長さか) -> 統合パターン
+_FUSED_NG_PATTERNS = {
+    (with_url, with_caps): _compile_fused_ng_pattern(with_url, with_caps)
+    for with_url in (False, True) for with_caps in (False, True)
+}
+
+
+# _clean_messageで連続した記号を1つにまとめるパターン
+_REPEATED_EXCLAMATION_RE = re.compile(r'[‼！]{2,}')
+_REPEATED_QUESTION_RE = re.compile(r'[？?]{2,}')
+# 「！」「？」系の記号が2つ以上続く箇所（メッセージ全体はこの1パターンだけで走査する）
+_REPEATED_PUNCTUATION_RE = re.compile(r'[‼！？?]{2,}')
+
+
+def _normalize_repeated_punctuation(match: re.Match) -> str:
+    """連続した記号の塊の中で、同じ種類の連続を1つにまとめる"""
+    run = _REPEATED_EXCLAMATION_RE.sub('！', match.group())
+    return _REPEATED_QUESTION_RE.sub('？', run)
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_ng_word_file(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    NGワードファイルを解析する（更新時刻とサイズもキーにして、変更がなければキャッシュを返す）
+    
+    空行をスキップ。#で始まる行はコメントだが、#単体はNGワードとして扱う
+    """
+    words = (line.strip() for line in Path(path).read_text(encoding='utf-8').splitlines())
+    return tuple(word for word in words if word and not (word.startswith('#') and len(word) > 1))
+
+
+def _build_ng_word_lookup(ng_words: Iterable[str]) -> Dict[str, str]:
+    """NGワードを一度だけ小文字化し、小文字 -> 元の表記の辞書にする（同じ小文字は最初の表記を使う）"""
+    lookup: Dict[str, str] = {}
+    for ng_word in ng_words:
+        lookup.setdefault(ng_word.lower(), ng_word)
+    return lookup
+
+
+def _ng_trie_pattern(node: Dict[str, dict]) -> str:
+    """NGワードのトライの1ノード以下を正規表現にする（""キーはそこでワードが終わる印）"""
+    branches = [re.escape(char) + _ng_trie_pattern(child) for char, child in node.items() if char]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # ここで終わるワードもあるので、続きは省略可能にする
+        pattern = f"(?:{pattern})?" if len(branches) == 1 else pattern + "?"
+    return pattern
+
+
+def _compile_ng_regex(ng_words_lower: Collection[str], word_boundary: bool) -> Optional[re.Pattern]:
+    """
+    小文字化済みの全NGワードを1つの選択パターンにまとめる（NGワードがなければNone）
+    
+    ワードを並べただけの選択だと各位置で全ワードを試すため、先頭文字ごとに枝分かれする
+    トライ形式のパターンにして、各位置で試すのを先頭文字が一致する枝だけにする。
+    """
+    if not ng_words_lower:
+        return None
+    trie: Dict[str, dict] = {}
+    for word in ng_words_lower:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    alternation = _ng_trie_pattern(trie)
+    if word_boundary:
+        # 境界は幅ゼロの先読み・後読みで表す（一括走査で隣のメッセージの境界文字を消費しないため）
+        return re.compile(rf'(?<!\w)(?:{alternation})(?!\w)', re.IGNORECASE)
+    return re.compile(alternation)
+
+
+def _compile_ng_word_patterns(ng_word_lookup: Dict[str, str]) -> Tuple[Tuple[str, re.Pattern, str], ...]:
+    """
+    単語境界モード用に、NGワードごとの境界付きパターンをリスト順で作る
+    
+    (小文字のワード, パターン, 元の表記) のタプル。境界の条件は _compile_ng_regex と同じ
+    """
+    return tuple(
+        (ng_word_lower, re.compile(rf'(?<!\w){re.escape(ng_word_lower)}(?!\w)', re.IGNORECASE), ng_word)
+        for ng_word_lower, ng_word in ng_word_lookup.items()
+    )
+
+
 class CommentFilter:
     """コメントのフィルタリングを行うクラス"""
     
+    # 全インスタンスで共有するデフォルトNGワードとその選択パターン（初回生成時に読み込む）
+    _shared_ng: Optional[Tuple[Tuple[str, ...], Dict[str, str], Optional[re.Pattern]]] = None
+    _shared_ng_lock = threading.Lock()
+    
     def __init__(self, config_path: Optional[str] = None):
         self.ng_words: List[str] = []
-        self.ng_patterns: List[re.Pattern] = []
-        self.allowed_users: List[str] = []
-        self.blocked_users: List[str] = []
+        # ユーザーはコメントごとに所属判定するためsetで持つ
+        self.allowed_users: Set[str] = set()
+        self.blocked_users: Set[str] = set()
         self.min_comment_length = 1
         self.max_comment_length = 200
         
@@ -24,6 +190,17 @@ class CommentFilter:
         self.strict_matching = True  # 厳密な部分一致（現在の動作）
         self.word_boundary_checking = False  # 単語境界チェック（誤検知を減らす）
         
+        # 全NGワードを1つにまとめた正規表現（NGワードやモードの変更時に作り直す）
+        self._ng_regex: Optional[re.Pattern] = None
+        # 単語境界モードで理由のワードを特定するためのワードごとのパターン（_ng_regexと一緒に作る）
+        self._ng_word_patterns: Optional[Tuple[Tuple[str, re.Pattern, str], ...]] = None
+        # 小文字化したNGワード -> 元の表記（マッチした文字列から理由に出すワードを引く）
+        self._ng_word_lookup: Optional[Dict[str, str]] = None
+        # メッセージ内容の判定結果のキャッシュ（連投された同じメッセージを再判定しない）
+        self._filter_message = functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)(
+            self._filter_message_uncached
+        )
+        
         # デフォルト設定の読み込み
         self._load_default_filters()
         
@@ -32,33 +209,32 @@ class CommentFilter:
             self.load_config(config_path)
     
     def _load_default_filters(self):
-        """デフォルトのフィルタリング設定を読み込み"""
-        # 基本的なNGワード
-        default_ng_words = [
-            "スパム", "宣伝", "広告", "アンチ", "荒らし",
-            "死ね", "消えろ", "うざい", "きもい", "ブス",
-            "詐欺", "騙", "違法", "犯罪", "殺"
-        ]
-        
-        # 英語のNGワード
-        english_ng_words = [
-            "spam", "advertisement", "scam", "fake", "bot",
-            "hate", "kill", "die", "stupid", "ugly"
-        ]
+        """デフォルトのフィルタリング設定を読み込み（NGワードはインスタンス間で共有）"""
+        with CommentFilter._shared_ng_lock:
+            if CommentFilter._shared_ng is None:
+                CommentFilter._shared_ng = self._build_shared_ng()
+            ng_words, ng_word_lookup, ng_regex = CommentFilter._shared_ng
         
+        self.ng_words = list(ng_words)
+        self._ng_word_lookup = ng_word_lookup
+        # 初期状態（厳密な部分一致）ではそのまま共有パターンを使える
+        self._ng_regex = ng_regex
+    
+    def _build_shared_ng(self) -> Tuple[Tuple[str, ...], Dict[str, str], Optional[re.Pattern]]:
+        """デフォルトNGワード（組み込み + txt/ng_word.txt）を読み込んでパターンを作る"""
         # txt/ng_word.txtからNGワードを読み込み
         ng_words_from_file = self._load_ng_words_from_file()
         
-        self.ng_words = default_ng_words + english_ng_words + ng_words_from_file
+        # 組み込みとファイルで重複するワードは最初の1つだけを残す（順序は保つ）
+        ng_words = tuple(dict.fromkeys(_DEFAULT_NG_WORDS + _ENGLISH_NG_WORDS + tuple(ng_words_from_file)))
         
-        # 正規表現パターン（URL、連続文字など）
-        self.ng_patterns = [
-            re.compile(r'https?://[^\s]+', re.IGNORECASE),  # URL
-            re.compile(r'(.)\1{4,}'),  # 同じ文字の5回以上連続
-            re.compile(r'[!@#$%^&*]{3,}'),  # 記号の連続
-            re.compile(r'^\d+$'),  # 数字のみ
-            re.compile(r'[A-Z]{10,}'),  # 大文字の連続
-        ]
+        # ワードが変わっていなければ、構築済みの辞書とパターンをそのまま使う
+        current = CommentFilter._shared_ng
+        if current is not None and current[0] == ng_words:
+            return current
+        
+        ng_word_lookup = _build_ng_word_lookup(ng_words)
+        return ng_words, ng_word_lookup, _compile_ng_regex(ng_word_lookup.keys(), word_boundary=False)
     
     def _load_ng_words_from_file(self) -> List[str]:
         """txt/ng_word.txtファイルからNGワードを読み込み"""
@@ -66,19 +242,12 @@ class CommentFilter:
         ng_word_file = Path("txt/ng_word.txt")
         
         try:
-            if ng_word_file.exists():
-                with open(ng_word_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        word = line.strip()
-                        # 空行をスキップ、#単体はNGワードとして扱う
-                        if word:
-                            # #で始まるが#単体でない場合のみコメント行として扱う
-                            if word.startswith('#') and len(word) > 1:
-                                continue  # コメント行をスキップ
-                            ng_words.append(word)
-                print(f"[CommentFilter] NGワードファイルから {len(ng_words)} 個のワードを読み込みました")
-            else:
-                print(f"[CommentFilter] NGワードファイルが見つかりません: {ng_word_file}")
+            # 更新時刻とサイズが前回と同じなら、解析済みの結果を使い回す
+            stat = ng_word_file.stat()
+            ng_words = list(_parse_ng_word_file(str(ng_word_file), stat.st_mtime_ns, stat.st_size))
+            print(f"[CommentFilter] NGワードファイルから {len(ng_words)} 個のワードを読み込みました")
+        except FileNotFoundError:
+            print(f"[CommentFilter] NGワードファイルが見つかりません: {ng_word_file}")
         except Exception as e:
             print(f"[CommentFilter] NGワードファイル読み込みエラー: {e}")
         
@@ -95,13 +264,14 @@ class CommentFilter:
                 # NGワードの追加
                 if 'ng_words' in config:
                     self.ng_words.extend(config['ng_words'])
+                    self._invalidate_ng_regex()
                 
                 # ユーザーリストの設定
                 if 'allowed_users' in config:
-                    self.allowed_users = config['allowed_users']
+                    self.allowed_users = set(config['allowed_users'])
                 
                 if 'blocked_users' in config:
-                    self.blocked_users = config['blocked_users']
+                    self.blocked_users = set(config['blocked_users'])
                 
                 # 文字数制限
                 if 'min_comment_length' in config:
@@ -123,7 +293,7 @@ class CommentFilter:
         except Exception as e:
             print(f"Warning: Failed to load filter config: {e}")
     
-    def filter_comment(self, comment_data: Dict[str, Any]) -> Dict[str, Any]:
+    def filter_comment(self, comment_data: Dict[str, Any]) -> FilterResult:
         """
         コメントをフィルタリングして結果を返す
         
@@ -131,108 +301,170 @@ class CommentFilter:
             comment_data: コメントデータ（message, author情報を含む）
         
         Returns:
-            フィルタリング結果を含む辞書
-            {
-                'allowed': bool,  # コメントが許可されるか
-                'reason': str,    # 拒否された場合の理由
-                'original': dict, # 元のコメントデータ
-                'cleaned': str    # クリーニング後のメッセージ（allowedがTrueの場合）
-            }
+            フィルタリング結果（allowed, reason, original, cleaned）
+        """
+        return self._filter_comment(comment_data)
+    
+    def filter_comments_batch(self, comments: List[Dict[str, Any]]) -> List[FilterResult]:
+        """
+        複数コメントをまとめてフィルタリングする
+        
+        文字数やユーザーで拒否されるコメントを先に除き、残りのメッセージを区切り文字で
+        連結して NGワードの正規表現を1回だけ走査する。各コメントで最初にマッチした
+        NGワードをそのまま判定に使う。
+        
+        Returns:
+            commentsと同じ順序の filter_comment の結果リスト
+        """
+        if len(comments) <= 1:
+            return [self._filter_comment(comment) for comment in comments]
+        
+        ng_hits: Dict[int, str] = {}
+        ng_regex = self._get_ng_regex()
+        if ng_regex is not None:
+            # 正規表現の前に判定が決まるもの（文字数・ユーザー）は走査対象から外す
+            min_length = self.min_comment_length
+            max_length = self.max_comment_length
+            blocked_users = self.blocked_users
+            allowed_users = self.allowed_users
+            indices = []
+            messages = []
+            for index, comment in enumerate(comments):
+                message = comment.get('message', '')
+                if not min_length <= len(message) <= max_length:
+                    continue
+                if blocked_users or allowed_users:
+                    author = comment.get('author')
+                    author_name = author.get('name', '') if author else ''
+                    if author_name in blocked_users or (allowed_users and author_name not in allowed_users):
+                        continue
+                indices.append(index)
+                messages.append(message.lower())
+            
+            # 各メッセージの連結後の開始位置（マッチ位置 -> コメント番号の変換用）
+            starts = []
+            offset = 0
+            for message in messages:
+                starts.append(offset)
+                offset += len(message) + len(_BATCH_SEPARATOR)
+            joined = _BATCH_SEPARATOR.join(messages)
+            for match in ng_regex.finditer(joined):
+                # 各コメントで最初にマッチしたNGワードを記録する
+                ng_hits.setdefault(indices[bisect_right(starts, match.start()) - 1], match.group())
+        
+        return [
+            self._filter_comment(comment, ng_prescanned=True, ng_match=ng_hits.get(index))
+            for index, comment in enumerate(comments)
+        ]
+    
+    def _filter_comment(self, comment_data: Dict[str, Any], ng_prescanned: bool = False,
+                        ng_match: Optional[str] = None) -> FilterResult:
+        """
+        filter_comment本体。
+        ng_prescannedがTrueなら、NGワードの判定には走査済みのng_match（マッチした文字列、なければNone）を使う
         """
         message = comment_data.get('message', '')
-        author_name = comment_data.get('author', {}).get('name', '')
+        author = comment_data.get('author')
+        author_name = author.get('name', '') if author else ''
+        blocked_users = self.blocked_users
+        allowed_users = self.allowed_users
         
         # 1. ユーザーベースのフィルタリング
-        if self.blocked_users and author_name in self.blocked_users:
-            return {
-                'allowed': False,
-                'reason': f'ブロックされたユーザー: {author_name}',
-                'original': comment_data,
-                'cleaned': ''
-            }
+        if blocked_users and author_name in blocked_users:
+            return FilterResult(False, f'ブロックされたユーザー: {author_name}', comment_data, '')
         
         # 許可ユーザーリストがある場合、それ以外は拒否
-        if self.allowed_users and author_name not in self.allowed_users:
-            return {
-                'allowed': False,
-                'reason': f'許可リストにないユーザー: {author_name}',
-                'original': comment_data,
-                'cleaned': ''
-            }
+        if allowed_users and author_name not in allowed_users:
+            return FilterResult(False, f'許可リストにないユーザー: {author_name}', comment_data, '')
+        
+        # 2〜5. メッセージ内容の判定（同じメッセージの結果はキャッシュから返す）
+        allowed, reason, cleaned_message = self._filter_message(
+            message, self.min_comment_length, self.max_comment_length,
+            ng_match if ng_prescanned else _NOT_PRESCANNED
+        )
+        return FilterResult(allowed, reason, comment_data, cleaned_message)
+    
+    def _filter_message_uncached(self, message: str, min_length: int, max_length: int,
+                                 ng_match: Any) -> Tuple[bool, str, str]:
+        """
+        メッセージ内容だけで決まる判定（文字数・NGワード・パターン・クリーニング）
+        
+        Returns:
+            (allowed, reason, cleaned) のタプル
+        """
+        message_length = len(message)
         
         # 2. 文字数チェック
-        if len(message) < self.min_comment_length:
-            return {
-                'allowed': False,
-                'reason': f'コメントが短すぎます（{len(message)}文字）',
-                'original': comment_data,
-                'cleaned': ''
-            }
+        if message_length < min_length:
+            return False, f'コメントが短すぎます（{message_length}文字）', ''
         
-        if len(message) > self.max_comment_length:
-            return {
-                'allowed': False,
-                'reason': f'コメントが長すぎます（{len(message)}文字）',
-                'original': comment_data,
-                'cleaned': ''
-            }
+        if message_length > max_length:
+            return False, f'コメントが長すぎます（{message_length}文字）', ''
         
-        # 3. NGワードチェック
-        message_lower = message.lower()
-        for ng_word in self.ng_words:
-            if self._check_ng_word_match(message_lower, ng_word.lower()):
-                return {
-                    'allowed': False,
-                    'reason': f'NGワードを含んでいます: {ng_word}',
-                    'original': comment_data,
-                    'cleaned': ''
-                }
+        # 3. NGワードチェック（まとめた正規表現で1回走査し、ヒットした時だけどのNGワードかを調べる）
+        if ng_match is _NOT_PRESCANNED:
+            ng_regex = self._get_ng_regex()
+            match = ng_regex.search(message.lower()) if ng_regex is not None else None
+            ng_match = match.group() if match else None
+        if ng_match is not None:
+            # 理由にはリスト順で最初のNGワードを出す（複数含む場合もマッチ位置には依らない）
+            ng_word = self._first_ng_word(message.lower()) or self._get_ng_word_lookup().get(ng_match, ng_match)
+            return False, f'NGワードを含んでいます: {ng_word}', ''
         
-        # 4. 正規表現パターンチェック
-        for pattern in self.ng_patterns:
-            if pattern.search(message):
-                return {
-                    'allowed': False,
-                    'reason': f'不適切なパターンを含んでいます: {pattern.pattern}',
-                    'original': comment_data,
-                    'cleaned': ''
-                }
+        # 4. 正規表現パターンチェック（まとめたパターンで1回だけ検索する。
+        #    「://」が無ければURL、短ければ大文字の連続は調べない）
+        fused_pattern = _FUSED_NG_PATTERNS['://' in message, message_length >= _CAPS_MIN_LENGTH]
+        if fused_pattern.search(message):
+            # 理由にはリスト順で最初に該当するパターンを出す（ヒットした時だけ個別に調べる）
+            pattern = next(pattern for pattern in _DEFAULT_NG_PATTERNS if pattern.search(message))
+            return False, f'不適切なパターンを含んでいます: {pattern.pattern}', ''
         
         # 5. コメントのクリーニング
-        cleaned_message = self._clean_message(message)
-        
-        return {
-            'allowed': True,
-            'reason': 'フィルタリング通過',
-            'original': comment_data,
-            'cleaned': cleaned_message
-        }
+        return True, _REASON_PASS, self._clean_message(message)
     
     def _clean_message(self, message: str) -> str:
         """コメントメッセージのクリーニング"""
-        # 余分な空白を削除
-        cleaned = re.sub(r'\s+', ' ', message.strip())
+        # 余分な空白を削除（split/joinで前後の除去と連続空白の圧縮を1回で行う）
+        cleaned = " ".join(message.split())
         
-        # 特殊文字の正規化
-        cleaned = re.sub(r'[‼！]{2,}', '！', cleaned)
-        cleaned = re.sub(r'[？?]{2,}', '？', cleaned)
-        
-        return cleaned
+        # 特殊文字の正規化（記号が続く箇所だけを取り出して置換する）
+        return _REPEATED_PUNCTUATION_RE.sub(_normalize_repeated_punctuation, cleaned)
+    
+    def _first_ng_word(self, message_lower: str) -> Optional[str]:
+        """メッセージに含まれるNGワードのうち、リスト順で最初のものを元の表記で返す"""
+        if not self.strict_matching and self.word_boundary_checking:
+            # 単語境界モードでは、まとめた正規表現と同じ前後の条件を満たすものだけを数える
+            self._get_ng_regex()
+            for ng_word_lower, pattern, ng_word in self._ng_word_patterns:
+                if ng_word_lower in message_lower and pattern.search(message_lower):
+                    return ng_word
+            return None
+        for ng_word_lower, ng_word in self._get_ng_word_lookup().items():
+            if ng_word_lower in message_lower:
+                return ng_word
+        return None
+    
+    def _get_ng_regex(self) -> Optional[re.Pattern]:
+        """全NGワードの選択パターンを返す（未構築なら現在のモードに合わせて構築）"""
+        if self._ng_regex is None:
+            word_boundary = not self.strict_matching and self.word_boundary_checking
+            ng_word_lookup = self._get_ng_word_lookup()
+            self._ng_regex = _compile_ng_regex(ng_word_lookup.keys(), word_boundary)
+            self._ng_word_patterns = _compile_ng_word_patterns(ng_word_lookup) if word_boundary else None
+        return self._ng_regex
     
-    def _check_ng_word_match(self, message_lower: str, ng_word_lower: str) -> bool:
-        """NGワードマッチングのロジック（設定に応じて厳密さを調整）"""
-        if self.strict_matching:
-            # 厳密な部分一致（現在の動作）
-            return ng_word_lower in message_lower
-        elif self.word_boundary_checking:
-            # 単語境界を考慮した部分一致（誤検知を減らす）
-            import re
-            # 日本語と英語の単語境界を考慮
-            pattern = rf'(?:^|[^\w]){re.escape(ng_word_lower)}(?:[^\w]|$)'
-            return bool(re.search(pattern, message_lower, re.IGNORECASE))
-        else:
-            # デフォルトは厳密な部分一致
-            return ng_word_lower in message_lower
+    def _get_ng_word_lookup(self) -> Dict[str, str]:
+        """小文字化したNGワードから元の表記を引く辞書を返す（未構築なら構築）"""
+        if self._ng_word_lookup is None:
+            self._ng_word_lookup = _build_ng_word_lookup(self.ng_words)
+        return self._ng_word_lookup
+    
+    def _invalidate_ng_regex(self):
+        """NGワードやマッチングモードの変更後に呼び、次回のチェックで作り直させる"""
+        self._ng_regex = None
+        self._ng_word_lookup = None
+        self._ng_word_patterns = None
+        self._filter_message.cache_clear()
     
     def set_matching_mode(self, strict: bool = True, word_boundary: bool = False):
         """マッチングモードを設定"""
@@ -240,6 +472,7 @@ class CommentFilter:
         self.word_boundary_checking = word_boundary
         if word_boundary:
             self.strict_matching = False  # 単語境界チェック時は厳密マッチを無効
+        self._invalidate_ng_regex()
         
         mode_desc = "厳密な部分一致" if strict else ("単語境界チェック" if word_boundary else "標準")
         print(f"[CommentFilter] マッチングモード: {mode_desc}")
@@ -249,7 +482,6 @@ class CommentFilter:
         matching_mode = "厳密な部分一致" if self.strict_matching else ("単語境界チェック" if self.word_boundary_checking else "標準")
         return {
             'ng_words_count': len(self.ng_words),
-            'ng_patterns_count': len(self.ng_patterns),
             'allowed_users_count': len(self.allowed_users),
             'blocked_users_count': len(self.blocked_users),
             'min_length': self.min_comment_length,
@@ -261,44 +493,35 @@ class CommentFilter:
         """NGワードを動的に追加"""
         if word not in self.ng_words:
             self.ng_words.append(word)
+            self._invalidate_ng_regex()
     
     def remove_ng_word(self, word: str):
         """NGワードを削除"""
         if word in self.ng_words:
             self.ng_words.remove(word)
+            self._invalidate_ng_regex()
     
     def add_blocked_user(self, username: str):
         """ブロックユーザーを追加"""
-        if username not in self.blocked_users:
-            self.blocked_users.append(username)
+        self.blocked_users.add(username)
     
     def remove_blocked_user(self, username: str):
         """ブロックユーザーを削除"""
-        if username in self.blocked_users:
-            self.blocked_users.remove(username)
+        self.blocked_users.discard(username)
     
     def reload_ng_words(self):
-        """NGワードファイルを再読み込み"""
+        """NGワードファイルを再読み込み（共有のNGワードも更新する）"""
         print("[CommentFilter] NGワードファイルを再読み込み中...")
         
-        # 基本的なNGワード
-        default_ng_words = [
-            "スパム", "宣伝", "広告", "アンチ", "荒らし",
-            "死ね", "消えろ", "うざい", "きもい", "ブス",
-            "詐欺", "騙", "違法", "犯罪", "殺"
-        ]
-        
-        # 英語のNGワード
-        english_ng_words = [
-            "spam", "advertisement", "scam", "fake", "bot",
-            "hate", "kill", "die", "stupid", "ugly"
-        ]
-        
-        # ファイルからNGワードを再読み込み
-        ng_words_from_file = self._load_ng_words_from_file()
+        # ファイルからNGワードを再読み込みし、以降に生成されるインスタンスとも共有する
+        shared_ng = self._build_shared_ng()
+        with CommentFilter._shared_ng_lock:
+            CommentFilter._shared_ng = shared_ng
         
         # NGワードリストを更新
-        self.ng_words = default_ng_words + english_ng_words + ng_words_from_file
+        self.ng_words = list(shared_ng[0])
+        self._invalidate_ng_regex()
+        self._ng_word_lookup = shared_ng[1]
         print(f"[CommentFilter] NGワード再読み込み完了: 合計 {len(self.ng_words)} 個")
 
 